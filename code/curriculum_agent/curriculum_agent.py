@@ -3,17 +3,192 @@ Curriculum agent class for generating lesson plans with OpenAI integration.
 """
 
 from .models import (
+    DEFAULT_CONSTRAINTS,
+    Constraint,
+    GradeLevel,
     LessonPlanInput,
     LessonPlanOutput,
     LearningObjective,
     ContentSection,
     Assessment,
 )
-from typing import Optional
-import datetime
+from .templates import enhanced_fallback_template
+from educator_agent.topics import topic_tokens
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+import asyncio
+import hashlib
 import json
 import os
-from openai import OpenAI
+import re
+import threading
+import time
+
+import orjson
+from pydantic import BaseModel, Field, ValidationError
+
+# Static instructions shared by every request. Keeping them at the very start of
+# the system prompt lets OpenAI's automatic prompt caching reuse the prefix.
+SYSTEM_PROMPT_PREFIX = """
+You are an expert curriculum designer creating lesson plans for K-12 students.
+
+Your task is to create a comprehensive lesson plan that:
+1. Is pedagogically sound and age-appropriate
+2. Uses vocabulary suitable for the target grade level
+3. Accounts for the stated audience baseline
+4. Strictly adheres to all listed constraints
+5. Follows educational best practices
+
+Every lesson plan must include:
+- 3-5 specific learning objectives with Bloom's taxonomy levels
+- Detailed content breakdown with timing
+- Multiple assessment methods
+- Required materials and prerequisites
+- Key vocabulary with grade-appropriate definitions
+- Age-appropriate activities and examples
+
+IMPORTANT: Never request, reference, or suggest collecting personal student information.
+Use only generic examples and avoid any content that could identify individual students.
+
+Respond ONLY with valid JSON matching the lesson plan schema.
+"""
+
+
+class _AIResponseDraft(BaseModel):
+    """The subset of a lesson plan the model generates; the rest comes from input."""
+
+    lesson_title: Optional[str] = None
+    learning_objectives: List[LearningObjective] = Field(default_factory=list)
+    content_breakdown: List[ContentSection] = Field(default_factory=list)
+    assessments: List[Assessment] = Field(default_factory=list)
+    prerequisites: List[str] = Field(default_factory=list)
+    materials: List[str] = Field(default_factory=list)
+    vocabulary: List[Dict[str, str]] = Field(default_factory=list)
+    age_appropriateness_notes: Optional[str] = None
+
+
+# JSON schema sent with each request so the model returns structured output
+LESSON_SCHEMA = _AIResponseDraft.model_json_schema()
+
+_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "lesson_plan",
+        "schema": LESSON_SCHEMA,
+        # Strict mode rejects the free-form vocabulary dicts
+        "strict": False,
+    },
+}
+
+
+# One sync client per API key so agents share HTTP connection pools
+_CLIENT_CACHE: Dict[str, Any] = {}
+_CLIENT_LOCK = threading.Lock()
+
+
+def _shared_client(api_key: str):
+    """Return the process-wide OpenAI client for an API key, creating it once."""
+    with _CLIENT_LOCK:
+        client = _CLIENT_CACHE.get(api_key)
+        if client is None:
+            import httpx
+            from openai import DefaultHttpxClient, OpenAI
+
+            client = OpenAI(
+                api_key=api_key,
+                http_client=DefaultHttpxClient(
+                    limits=httpx.Limits(
+                        max_connections=100, max_keepalive_connections=50
+                    )
+                ),
+            )
+            _CLIENT_CACHE[api_key] = client
+    return client
+
+
+def _utcnow_iso() -> str:
+    """Return the current UTC time as an ISO-8601 string with microseconds."""
+    seconds, nanos = divmod(time.time_ns(), 1_000_000_000)
+    stamp = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds))
+    return f"{stamp}.{nanos // 1000:06d}"
+
+
+def _format_constraints(constraints: List[Constraint]) -> str:
+    """Render constraints, already ordered by priority, as prompt bullets."""
+    return "\n".join(
+        [f"- {c.name} (Priority {c.priority}): {c.description}" for c in constraints]
+    )
+
+
+# Most requests use the default constraints, so render them once
+_DEFAULT_CONSTRAINTS_TEXT = _format_constraints(
+    sorted(DEFAULT_CONSTRAINTS, key=lambda c: -c.priority)
+)
+
+
+def _constraints_block(constraints_text: str) -> str:
+    """Wrap rendered constraints in the request-specific system prompt tail."""
+    return f"""
+CRITICAL CONSTRAINTS (MUST BE ENFORCED):
+{constraints_text}
+"""
+
+
+_DEFAULT_SYSTEM_PROMPT = SYSTEM_PROMPT_PREFIX + _constraints_block(
+    _DEFAULT_CONSTRAINTS_TEXT
+)
+
+# Requests that are answered locally instead of being sent to the model
+_SUPPORTED_GRADE_LEVELS = frozenset(g.value for g in GradeLevel)
+_MIN_DURATION_MINUTES = 10
+_BLOCKED_TOPIC_PHRASES = (
+    "ignore previous instructions",
+    "ignore all previous",
+    "disregard the above",
+    "system prompt",
+    "jailbreak",
+)
+
+# Batch job states after which no further progress will be made
+_BATCH_TERMINAL_STATES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+
+class _ArrayItemScanner:
+    """Pull completed items out of one JSON array while the document streams in."""
+
+    def __init__(self, key: str):
+        self._key_re = re.compile(rf'"{re.escape(key)}"\s*:\s*\[')
+        self._decoder = json.JSONDecoder()
+        self._pos: Optional[int] = None
+        self._done = False
+
+    def feed(self, buffer: str) -> List[Any]:
+        """Return the array items that became complete since the last call."""
+        items: List[Any] = []
+        if self._done:
+            return items
+        if self._pos is None:
+            match = self._key_re.search(buffer)
+            if match is None:
+                return items
+            self._pos = match.end()
+
+        while True:
+            pos = self._pos
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos >= len(buffer):
+                break
+            if buffer[pos] == "]":
+                self._done = True
+                break
+            try:
+                item, self._pos = self._decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # The item is still incomplete; wait for more text
+                break
+            items.append(item)
+        return items
 
 
 class CurriculumAgent:
@@ -22,162 +197,244 @@ class CurriculumAgent:
     while enforcing strict constraints for student safety and privacy.
     """
 
-    def __init__(self, api_key: Optional[str] = None, use_fallback: bool = False):
-        """Initialize the curriculum agent with OpenAI client."""
+    DEFAULT_MODEL = "gpt-4o-mini"
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        use_fallback: bool = False,
+        model: Optional[str] = None,
+        cache_size: int = 512,
+    ):
+        """Initialize the curriculum agent; OpenAI clients are created on first use."""
         self.use_fallback = use_fallback
         api_key = api_key or os.getenv("OPENAI_API_KEY")
 
         if not use_fallback and api_key:
-            self.client = OpenAI(api_key=api_key)
-            self.model = "gpt-4"
+            self._api_key = api_key
+            self.model = model or self.DEFAULT_MODEL
         else:
-            self.client = None
+            self._api_key = None
             self.model = None
             self.use_fallback = True
 
-    def _create_system_prompt(self, input_data: LessonPlanInput) -> str:
-        """Create a comprehensive system prompt with constraint enforcement."""
-        constraints_text = "\n".join(
-            [
-                f"- {c.name} (Priority {c.priority}): {c.description}"
-                for c in sorted(
-                    input_data.constraints, key=lambda x: x.priority, reverse=True
-                )
-            ]
+        self._client = None
+        self._aclient = None
+
+        self.temperature = 0.7
+        self.max_tokens = 2000
+
+        # Exact-match cache of parsed lesson plans, keyed by request hash
+        self.cache_size = cache_size
+        self._response_cache: "OrderedDict[str, LessonPlanOutput]" = OrderedDict()
+
+        # Cache for reworded requests, keyed by the normalized subject and
+        # baseline plus the exact grade level, duration, constraints and model
+        self._similar_cache: "OrderedDict[tuple, LessonPlanOutput]" = OrderedDict()
+
+    @property
+    def client(self):
+        """The sync OpenAI client, or None in fallback mode."""
+        if self._client is None and self._api_key:
+            self._client = _shared_client(self._api_key)
+        return self._client
+
+    @client.setter
+    def client(self, value) -> None:
+        self._client = value
+
+    @property
+    def aclient(self):
+        """The AsyncOpenAI client, or None in fallback mode."""
+        if self._aclient is None and self._api_key:
+            from openai import AsyncOpenAI
+
+            self._aclient = AsyncOpenAI(api_key=self._api_key)
+        return self._aclient
+
+    @aclient.setter
+    def aclient(self, value) -> None:
+        self._aclient = value
+
+    def _cache_key(self, system_prompt: str, user_prompt: str) -> str:
+        """Build a stable hash of every parameter that shapes the completion."""
+        parts = [
+            str(self.model),
+            system_prompt,
+            user_prompt,
+            str(self.temperature),
+            str(self.max_tokens),
+        ]
+        return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()
+
+    def _cache_get(self, key: str) -> Optional[LessonPlanOutput]:
+        """Return a copy of a cached lesson plan, or None on a miss."""
+        plan = self._response_cache.get(key)
+        if plan is None:
+            return None
+        self._response_cache.move_to_end(key)
+        return plan.model_copy(deep=True)
+
+    def _cache_put(self, key: str, plan: LessonPlanOutput) -> None:
+        """Store a copy of a lesson plan, evicting the least recently used entry."""
+        if self.cache_size <= 0:
+            return
+        self._response_cache[key] = plan.model_copy(deep=True)
+        self._response_cache.move_to_end(key)
+        while len(self._response_cache) > self.cache_size:
+            self._response_cache.popitem(last=False)
+
+    def _similarity_key(self, input_data: LessonPlanInput) -> tuple:
+        """Key under which rewordings of the same request coincide."""
+        # Only case, plurals and filler words are normalized away: any other
+        # difference in the subject or baseline is a different lesson
+        return (
+            self.model,
+            input_data.grade_level,
+            input_data.duration_minutes,
+            tuple((c.name, c.description, c.priority) for c in input_data.constraints),
+            topic_tokens(input_data.subject_topic),
+            topic_tokens(input_data.audience_baseline),
         )
 
-        return f"""
-You are an expert curriculum designer creating lesson plans for {input_data.grade_level} students.
-
-CRITICAL CONSTRAINTS (MUST BE ENFORCED):
-{constraints_text}
-
-Your task is to create a comprehensive lesson plan that:
-1. Is pedagogically sound and age-appropriate
-2. Uses vocabulary suitable for {input_data.grade_level}
-3. Accounts for the audience baseline: {input_data.audience_baseline}
-4. Strictly adheres to all listed constraints
-5. Follows educational best practices
+    def _similar_get(self, input_data: LessonPlanInput) -> Optional[LessonPlanOutput]:
+        """Return a copy of the cached plan for a reworded request, or None."""
+        key = self._similarity_key(input_data)
+        plan = self._similar_cache.get(key)
+        if plan is None:
+            return None
+        self._similar_cache.move_to_end(key)
+        # The stored title and notes were written for the earlier wording, so
+        # rebuild every request-derived field from this request
+        return plan.model_copy(
+            update={
+                "lesson_title": f"{input_data.subject_topic} - {input_data.grade_level}",
+                "subject": input_data.subject_topic,
+                "constraints_applied": [c.name for c in input_data.constraints],
+                "age_appropriateness_notes": f"Content adapted for {input_data.grade_level} level",
+                "created_timestamp": _utcnow_iso(),
+            },
+            deep=True,
+        )
 
-IMPORTANT: Never request, reference, or suggest collecting personal student information.
-Use only generic examples and avoid any content that could identify individual students.
+    def _similar_put(self, input_data: LessonPlanInput, plan: LessonPlanOutput) -> None:
+        """Remember a plan so rewordings of its request can reuse it."""
+        if self.cache_size <= 0:
+            return
+        key = self._similarity_key(input_data)
+        self._similar_cache[key] = plan.model_copy(deep=True)
+        self._similar_cache.move_to_end(key)
+        while len(self._similar_cache) > self.cache_size:
+            self._similar_cache.popitem(last=False)
+
+    def clear_cache(self) -> None:
+        """Drop all cached lesson plans."""
+        self._response_cache.clear()
+        self._similar_cache.clear()
 
-Respond ONLY with valid JSON matching the lesson plan schema.
-"""
+    def _create_system_prompt(self, input_data: LessonPlanInput) -> str:
+        """Create a comprehensive system prompt with constraint enforcement."""
+        if input_data.constraints == DEFAULT_CONSTRAINTS:
+            return _DEFAULT_SYSTEM_PROMPT
+        return SYSTEM_PROMPT_PREFIX + self._create_system_suffix(input_data)
+
+    def _create_system_suffix(self, input_data: LessonPlanInput) -> str:
+        """Create the request-specific tail of the system prompt."""
+        if input_data.constraints == DEFAULT_CONSTRAINTS:
+            constraints_text = _DEFAULT_CONSTRAINTS_TEXT
+        else:
+            # Sorted here rather than at validation: constraints can be
+            # reassigned after the input is built
+            constraints_text = _format_constraints(
+                sorted(input_data.constraints, key=lambda c: -c.priority)
+            )
+        return _constraints_block(constraints_text)
 
     def _create_user_prompt(self, input_data: LessonPlanInput) -> str:
         """Create the user prompt with specific lesson requirements."""
-        return f"""
-Create a {input_data.duration_minutes}-minute lesson plan for:
-
-Subject/Topic: {input_data.subject_topic}
-Grade Level: {input_data.grade_level}
-Audience Baseline: {input_data.audience_baseline}
-
-The lesson plan must include:
-- 3-5 specific learning objectives with Bloom's taxonomy levels
-- Detailed content breakdown with timing
-- Multiple assessment methods
-- Required materials and prerequisites
-- Key vocabulary with grade-appropriate definitions
-- Age-appropriate activities and examples
-
-Ensure all content is suitable for the specified grade level and respects the constraints.
-"""
+        return (
+            f"Subject: {input_data.subject_topic}\n"
+            f"Grade: {input_data.grade_level}\n"
+            f"Baseline: {input_data.audience_baseline}\n"
+            f"Duration: {input_data.duration_minutes} minutes"
+        )
 
-    def _parse_ai_response(
+    def _load_lesson_plan(
         self, response_text: str, input_data: LessonPlanInput
     ) -> LessonPlanOutput:
-        """Parse and validate the AI response into a structured lesson plan."""
-        try:
-            # Parse JSON response
-            data = json.loads(response_text)
-
-            # Create structured objects
-            learning_objectives = [
-                LearningObjective(**obj) for obj in data.get("learning_objectives", [])
-            ]
-
-            content_breakdown = [
-                ContentSection(**section)
-                for section in data.get("content_breakdown", [])
-            ]
-
-            assessments = [
-                Assessment(**assessment) for assessment in data.get("assessments", [])
-            ]
-
-            # Build final lesson plan
-            lesson_plan = LessonPlanOutput(
-                lesson_title=data.get(
-                    "lesson_title",
-                    f"{input_data.subject_topic} - {input_data.grade_level}",
-                ),
-                grade_level=input_data.grade_level,
-                subject=input_data.subject_topic,
-                duration_minutes=input_data.duration_minutes,
-                learning_objectives=learning_objectives,
-                content_breakdown=content_breakdown,
-                assessments=assessments,
-                prerequisites=data.get("prerequisites", []),
-                materials=data.get("materials", []),
-                vocabulary=data.get("vocabulary", []),
-                constraints_applied=[c.name for c in input_data.constraints],
-                age_appropriateness_notes=data.get(
-                    "age_appropriateness_notes",
-                    f"Content adapted for {input_data.grade_level} level",
-                ),
-                created_timestamp=datetime.datetime.utcnow().isoformat(),
-                compliance_verified=True,
-            )
-
-            return lesson_plan
-
-        except (json.JSONDecodeError, KeyError, TypeError) as e:
-            # Fallback to basic lesson plan if parsing fails
-            return self._create_fallback_lesson_plan(input_data, str(e))
+        """Build a lesson plan from the AI response, raising if it is malformed."""
+        # Parse and validate the JSON response in a single pass
+        draft = _AIResponseDraft.model_validate_json(response_text)
+
+        # Merge the generated content with the request-derived fields. Both
+        # sides are already validated, so the output is built without
+        # re-running validation.
+        return LessonPlanOutput.model_construct(
+            lesson_title=draft.lesson_title
+            or f"{input_data.subject_topic} - {input_data.grade_level}",
+            grade_level=input_data.grade_level,
+            subject=input_data.subject_topic,
+            duration_minutes=input_data.duration_minutes,
+            learning_objectives=draft.learning_objectives,
+            content_breakdown=draft.content_breakdown,
+            assessments=draft.assessments,
+            prerequisites=draft.prerequisites,
+            materials=draft.materials,
+            vocabulary=draft.vocabulary,
+            constraints_applied=[c.name for c in input_data.constraints],
+            age_appropriateness_notes=draft.age_appropriateness_notes
+            or f"Content adapted for {input_data.grade_level} level",
+            created_timestamp=_utcnow_iso(),
+            compliance_verified=True,
+        )
 
     def _create_fallback_lesson_plan(
         self, input_data: LessonPlanInput, error: str
     ) -> LessonPlanOutput:
         """Create a basic fallback lesson plan if AI response parsing fails."""
-        return LessonPlanOutput(
+        # Ten-minute opening and wrap-up, shrunk for short lessons so the
+        # sections always add up to the requested duration
+        duration = input_data.duration_minutes
+        edge_minutes = min(10, duration // 4)
+
+        # Built from trusted literals and validated input, so skip validation
+        return LessonPlanOutput.model_construct(
             lesson_title=f"{input_data.subject_topic} for {input_data.grade_level}",
             grade_level=input_data.grade_level,
             subject=input_data.subject_topic,
             duration_minutes=input_data.duration_minutes,
             learning_objectives=[
-                LearningObjective(
+                LearningObjective.model_construct(
                     id="obj1",
                     description=f"Students will understand basic concepts of {input_data.subject_topic}",
                     bloom_level="Understand",
                 )
             ],
             content_breakdown=[
-                ContentSection(
+                ContentSection.model_construct(
                     title="Introduction",
-                    duration_minutes=10,
+                    duration_minutes=edge_minutes,
                     content_type="introduction",
                     description=f"Introduce key concepts of {input_data.subject_topic}",
                     materials_needed=["Whiteboard", "Projector"],
                 ),
-                ContentSection(
+                ContentSection.model_construct(
                     title="Main Activity",
-                    duration_minutes=input_data.duration_minutes - 20,
+                    duration_minutes=duration - 2 * edge_minutes,
                     content_type="activity",
                     description="Engage students in learning activities",
                     materials_needed=["Worksheets", "Writing materials"],
                 ),
-                ContentSection(
+                ContentSection.model_construct(
                     title="Wrap-up",
-                    duration_minutes=10,
+                    duration_minutes=edge_minutes,
                     content_type="conclusion",
                     description="Review key concepts and assess understanding",
                     materials_needed=[],
                 ),
             ],
             assessments=[
-                Assessment(
+                Assessment.model_construct(
                     type="formative",
                     method="discussion",
                     description="Class discussion to assess understanding",
@@ -189,185 +446,339 @@ Ensure all content is suitable for the specified grade level and respects the co
             vocabulary=[{"term": "A key concept in the subject area"}],
             constraints_applied=[c.name for c in input_data.constraints],
             age_appropriateness_notes=f"Fallback plan created due to parsing error: {error}",
-            created_timestamp=datetime.datetime.utcnow().isoformat(),
+            created_timestamp=_utcnow_iso(),
             compliance_verified=True,
         )
 
+    def _preflight_check(self, input_data: LessonPlanInput) -> Optional[str]:
+        """
+        Decide whether a request can be answered without calling the model.
+
+        Raises:
+            ValueError: If the request has no subject to plan a lesson for
+
+        Returns:
+            The reason to serve a fallback plan directly, or None to proceed
+        """
+        topic = input_data.subject_topic.strip()
+        if not topic:
+            raise ValueError("subject_topic must not be empty")
+
+        duration = input_data.duration_minutes
+        if duration is not None and duration < _MIN_DURATION_MINUTES:
+            return f"duration of {duration} minutes is too short"
+        if input_data.grade_level not in _SUPPORTED_GRADE_LEVELS:
+            return f"unsupported grade level '{input_data.grade_level}'"
+
+        lowered = topic.lower()
+        if any(phrase in lowered for phrase in _BLOCKED_TOPIC_PHRASES):
+            return "subject topic was rejected by the safety filter"
+        return None
+
+    def _completion_params(self, system_prompt: str, user_prompt: str) -> dict:
+        """Build the chat completion arguments shared by every request path."""
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens,
+            "response_format": _RESPONSE_FORMAT,
+        }
+
+    def _lookup_cached_plan(
+        self, input_data: LessonPlanInput, cache_key: str
+    ) -> Optional[LessonPlanOutput]:
+        """Check the exact-match cache, then rewordings of the request."""
+        cached_plan = self._cache_get(cache_key)
+        if cached_plan is not None:
+            return cached_plan
+        return self._similar_get(input_data)
+
+    def _plan_from_response(
+        self, ai_response: str, input_data: LessonPlanInput, cache_key: str
+    ) -> LessonPlanOutput:
+        """Parse a completion and cache it; unparseable replies fall back uncached."""
+        try:
+            lesson_plan = self._load_lesson_plan(ai_response, input_data)
+        except ValidationError as e:
+            return self._create_fallback_lesson_plan(input_data, str(e))
+
+        self._cache_put(cache_key, lesson_plan)
+        self._similar_put(input_data, lesson_plan)
+        return lesson_plan
+
     def generate_lesson_plan(self, input_data: LessonPlanInput) -> LessonPlanOutput:
         """Generate a comprehensive lesson plan using OpenAI with constraint enforcement."""
         # Use fallback mode if no API client available
         if self.use_fallback or self.client is None:
             return self._create_enhanced_fallback_lesson_plan(input_data)
 
+        # Answer trivially handleable requests without an API call
+        reason = self._preflight_check(input_data)
+        if reason is not None:
+            return self._create_fallback_lesson_plan(input_data, reason)
+
         try:
             # Create prompts
             system_prompt = self._create_system_prompt(input_data)
             user_prompt = self._create_user_prompt(input_data)
 
+            # Serve repeated or paraphrased requests without a network call
+            cache_key = self._cache_key(system_prompt, user_prompt)
+            cached_plan = self._lookup_cached_plan(input_data, cache_key)
+            if cached_plan is not None:
+                return cached_plan
+
             # Call OpenAI API
             response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt},
-                ],
-                temperature=0.7,
-                max_tokens=2000,
+                **self._completion_params(system_prompt, user_prompt)
             )
 
             # Parse response
             ai_response = response.choices[0].message.content
-            return self._parse_ai_response(ai_response, input_data)
+            return self._plan_from_response(ai_response, input_data, cache_key)
 
         except Exception as e:
             # Fallback if API call fails
             return self._create_fallback_lesson_plan(input_data, f"API Error: {str(e)}")
 
+    def generate_lesson_plan_stream(
+        self, input_data: LessonPlanInput
+    ) -> Iterator[Union[LearningObjective, LessonPlanOutput]]:
+        """
+        Stream a lesson plan, yielding learning objectives as soon as they arrive.
+
+        Each ``LearningObjective`` is yielded once the model has finished
+        writing it, so callers can start rendering before generation ends. The
+        final item is always the complete ``LessonPlanOutput``, which is
+        authoritative if the reply later turns out to be malformed.
+        """
+        if self.use_fallback or self.client is None:
+            plan = self._create_enhanced_fallback_lesson_plan(input_data)
+            yield from plan.learning_objectives
+            yield plan
+            return
+
+        reason = self._preflight_check(input_data)
+        if reason is not None:
+            plan = self._create_fallback_lesson_plan(input_data, reason)
+            yield from plan.learning_objectives
+            yield plan
+            return
+
+        system_prompt = self._create_system_prompt(input_data)
+        user_prompt = self._create_user_prompt(input_data)
+        cache_key = self._cache_key(system_prompt, user_prompt)
+        cached_plan = self._lookup_cached_plan(input_data, cache_key)
+        if cached_plan is not None:
+            yield from cached_plan.learning_objectives
+            yield cached_plan
+            return
+
+        ai_response = ""
+        scanner = _ArrayItemScanner("learning_objectives")
+        try:
+            stream = self.client.chat.completions.create(
+                **self._completion_params(system_prompt, user_prompt), stream=True
+            )
+            for chunk in stream:
+                if not chunk.choices or not chunk.choices[0].delta.content:
+                    continue
+                ai_response += chunk.choices[0].delta.content
+                for item in scanner.feed(ai_response):
+                    try:
+                        yield LearningObjective.model_validate(item)
+                    except ValidationError:
+                        continue
+        except Exception as e:
+            yield self._create_fallback_lesson_plan(input_data, f"API Error: {str(e)}")
+            return
+
+        yield self._plan_from_response(ai_response, input_data, cache_key)
+
+    async def agenerate_lesson_plan(
+        self, input_data: LessonPlanInput
+    ) -> LessonPlanOutput:
+        """Async variant of generate_lesson_plan using the AsyncOpenAI client."""
+        if self.use_fallback or self.aclient is None:
+            return self._create_enhanced_fallback_lesson_plan(input_data)
+
+        reason = self._preflight_check(input_data)
+        if reason is not None:
+            return self._create_fallback_lesson_plan(input_data, reason)
+
+        try:
+            system_prompt = self._create_system_prompt(input_data)
+            user_prompt = self._create_user_prompt(input_data)
+
+            cache_key = self._cache_key(system_prompt, user_prompt)
+            cached_plan = self._lookup_cached_plan(input_data, cache_key)
+            if cached_plan is not None:
+                return cached_plan
+
+            response = await self.aclient.chat.completions.create(
+                **self._completion_params(system_prompt, user_prompt)
+            )
+
+            ai_response = response.choices[0].message.content
+            return self._plan_from_response(ai_response, input_data, cache_key)
+
+        except Exception as e:
+            return self._create_fallback_lesson_plan(input_data, f"API Error: {str(e)}")
+
+    async def agenerate_many(
+        self, inputs: List[LessonPlanInput], concurrency: int = 20
+    ) -> List[LessonPlanOutput]:
+        """
+        Generate lesson plans concurrently with at most ``concurrency`` in flight.
+
+        Args:
+            inputs: Lesson plan requests to generate
+            concurrency: Maximum number of simultaneous API requests
+
+        Returns:
+            Lesson plans in the same order as ``inputs``
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def generate(input_data: LessonPlanInput) -> LessonPlanOutput:
+            async with semaphore:
+                return await self.agenerate_lesson_plan(input_data)
+
+        return list(await asyncio.gather(*(generate(x) for x in inputs)))
+
+    def generate_lesson_plans_batch(
+        self, inputs: List[LessonPlanInput], poll_interval: float = 30.0
+    ) -> List[LessonPlanOutput]:
+        """
+        Generate many lesson plans through the OpenAI Batch API.
+
+        Batch jobs are billed at half the synchronous rate but may take up to
+        24 hours, so this suits bulk preparation rather than interactive use.
+        Cached plans are served locally and only the misses are submitted.
+
+        Args:
+            inputs: Lesson plan requests to generate
+            poll_interval: Seconds to wait between batch status checks
+
+        Returns:
+            Lesson plans in the same order as ``inputs``
+        """
+        if self.use_fallback or self.client is None:
+            return [self._create_enhanced_fallback_lesson_plan(x) for x in inputs]
+
+        results: List[Optional[LessonPlanOutput]] = [None] * len(inputs)
+        pending: Dict[str, Tuple[int, str]] = {}
+        lines = []
+
+        for i, input_data in enumerate(inputs):
+            # One invalid request gets its own fallback instead of failing
+            # the whole batch
+            try:
+                reason = self._preflight_check(input_data)
+            except ValueError as e:
+                reason = str(e)
+            if reason is not None:
+                results[i] = self._create_fallback_lesson_plan(input_data, reason)
+                continue
+
+            system_prompt = self._create_system_prompt(input_data)
+            user_prompt = self._create_user_prompt(input_data)
+            cache_key = self._cache_key(system_prompt, user_prompt)
+
+            cached_plan = self._lookup_cached_plan(input_data, cache_key)
+            if cached_plan is not None:
+                results[i] = cached_plan
+                continue
+
+            custom_id = f"plan-{i}"
+            pending[custom_id] = (i, cache_key)
+            lines.append(
+                orjson.dumps(
+                    {
+                        "custom_id": custom_id,
+                        "method": "POST",
+                        "url": "/v1/chat/completions",
+                        "body": self._completion_params(system_prompt, user_prompt),
+                    }
+                ).decode()
+            )
+
+        if pending:
+            batch_error = "Batch API Error: no response returned"
+            try:
+                responses = self._run_batch("\n".join(lines), poll_interval)
+            except Exception as e:
+                responses, batch_error = {}, f"Batch API Error: {str(e)}"
+
+            # Batch output order is not guaranteed, so match on custom_id
+            for custom_id, (i, cache_key) in pending.items():
+                input_data = inputs[i]
+                ai_response = responses.get(custom_id)
+                if ai_response is None:
+                    results[i] = self._create_fallback_lesson_plan(
+                        input_data, batch_error
+                    )
+                    continue
+                try:
+                    results[i] = self._plan_from_response(
+                        ai_response, input_data, cache_key
+                    )
+                except Exception as e:
+                    results[i] = self._create_fallback_lesson_plan(
+                        input_data, f"API Error: {str(e)}"
+                    )
+
+        return results
+
+    def _run_batch(self, jsonl: str, poll_interval: float) -> Dict[str, str]:
+        """Submit a JSONL batch, wait for it, and map custom_id to reply text."""
+        batch_file = self.client.files.create(
+            file=("lesson_plans.jsonl", jsonl.encode("utf-8")), purpose="batch"
+        )
+        batch = self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+
+        while batch.status not in _BATCH_TERMINAL_STATES:
+            time.sleep(poll_interval)
+            batch = self.client.batches.retrieve(batch.id)
+
+        if batch.status != "completed" or not batch.output_file_id:
+            raise RuntimeError(f"batch {batch.id} ended with status {batch.status}")
+
+        responses = {}
+        output = self.client.files.content(batch.output_file_id).text
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            record = orjson.loads(line)
+            response = record.get("response") or {}
+            if response.get("status_code") == 200:
+                message = response["body"]["choices"][0]["message"]
+                responses[record["custom_id"]] = message["content"]
+        return responses
+
     def _create_enhanced_fallback_lesson_plan(
         self, input_data: LessonPlanInput
     ) -> LessonPlanOutput:
         """Create an enhanced fallback lesson plan for demonstration purposes."""
-        # Create topic-specific content based on input
-        if "environmental" in input_data.subject_topic.lower():
-            objectives = [
-                LearningObjective(
-                    id="obj1",
-                    description="Students will define what an ecosystem is and identify its basic components",
-                    bloom_level="Remember",
-                ),
-                LearningObjective(
-                    id="obj2",
-                    description="Students will explain the relationships between living and non-living things in an ecosystem",
-                    bloom_level="Understand",
-                ),
-                LearningObjective(
-                    id="obj3",
-                    description="Students will analyze how changes in one part of an ecosystem affect other parts",
-                    bloom_level="Analyze",
-                ),
-            ]
-
-            vocabulary = [
-                {
-                    "ecosystem": "A community of living organisms and their physical environment working together"
-                },
-                {
-                    "habitat": "The natural environment where an organism lives and meets its needs"
-                },
-                {
-                    "food chain": "A series showing how energy moves from one organism to another"
-                },
-            ]
-
-            content = [
-                ContentSection(
-                    title="Introduction to Ecosystems",
-                    duration_minutes=10,
-                    content_type="introduction",
-                    description="Introduce the concept of ecosystems using familiar examples like a school garden or local park",
-                    materials_needed=["Ecosystem diagram", "Projector"],
-                ),
-                ContentSection(
-                    title="Ecosystem Components Activity",
-                    duration_minutes=20,
-                    content_type="activity",
-                    description="Students work in groups to identify living and non-living components in ecosystem pictures",
-                    materials_needed=[
-                        "Ecosystem photos",
-                        "Worksheets",
-                        "Colored pencils",
-                    ],
-                ),
-                ContentSection(
-                    title="Food Chain Demonstration",
-                    duration_minutes=10,
-                    content_type="demonstration",
-                    description="Show how energy flows through an ecosystem using yarn to connect organisms",
-                    materials_needed=["Yarn", "Organism cards"],
-                ),
-                ContentSection(
-                    title="Review and Assessment",
-                    duration_minutes=5,
-                    content_type="assessment",
-                    description="Quick review of key concepts and exit ticket",
-                    materials_needed=["Exit tickets"],
-                ),
-            ]
-        else:
-            # Generic lesson plan for other subjects
-            objectives = [
-                LearningObjective(
-                    id="obj1",
-                    description=f"Students will understand basic concepts of {input_data.subject_topic}",
-                    bloom_level="Understand",
-                )
-            ]
-            vocabulary = [{"term": "A key concept in the subject area"}]
-            content = [
-                ContentSection(
-                    title="Introduction",
-                    duration_minutes=10,
-                    content_type="introduction",
-                    description=f"Introduce key concepts of {input_data.subject_topic}",
-                    materials_needed=["Whiteboard", "Projector"],
-                ),
-                ContentSection(
-                    title="Main Activity",
-                    duration_minutes=input_data.duration_minutes - 20,
-                    content_type="activity",
-                    description="Engage students in learning activities",
-                    materials_needed=["Worksheets", "Writing materials"],
-                ),
-                ContentSection(
-                    title="Wrap-up",
-                    duration_minutes=10,
-                    content_type="conclusion",
-                    description="Review key concepts and assess understanding",
-                    materials_needed=[],
-                ),
-            ]
-
-        return LessonPlanOutput(
-            lesson_title=f"Introduction to {input_data.subject_topic} - {input_data.grade_level}",
-            grade_level=input_data.grade_level,
-            subject=input_data.subject_topic,
-            duration_minutes=input_data.duration_minutes,
-            learning_objectives=objectives,
-            content_breakdown=content,
-            assessments=[
-                Assessment(
-                    type="formative",
-                    method="discussion",
-                    description="Class discussion to assess understanding of key concepts",
-                    criteria=[
-                        "Participation in discussion",
-                        "Correct use of vocabulary",
-                    ],
-                ),
-                Assessment(
-                    type="formative",
-                    method="worksheet",
-                    description="Complete activity worksheet identifying ecosystem components",
-                    criteria=[
-                        "Accuracy of identifications",
-                        "Completion of all sections",
-                    ],
-                ),
-            ],
-            prerequisites=[
-                "Basic reading comprehension at grade level",
-                "Understanding of living vs. non-living things",
-            ],
-            materials=[
-                "Paper",
-                "Writing utensils",
-                "Whiteboard",
-                "Projector",
-                "Worksheets",
-            ],
-            vocabulary=vocabulary,
-            constraints_applied=[c.name for c in input_data.constraints],
-            age_appropriateness_notes=f"Content specifically designed for {input_data.grade_level} with simplified vocabulary and engaging activities appropriate for students with {input_data.audience_baseline}",
-            created_timestamp=datetime.datetime.utcnow().isoformat(),
-            compliance_verified=True,
+        # Clone the cached topic template and fill in the request details
+        template = enhanced_fallback_template(
+            input_data.subject_topic, input_data.duration_minutes
+        )
+        return template.model_copy(
+            update={
+                "lesson_title": f"Introduction to {input_data.subject_topic} - {input_data.grade_level}",
+                "grade_level": input_data.grade_level,
+                "constraints_applied": [c.name for c in input_data.constraints],
+                "age_appropriateness_notes": f"Content specifically designed for {input_data.grade_level} with simplified vocabulary and engaging activities appropriate for students with {input_data.audience_baseline}",
+                "created_timestamp": _utcnow_iso(),
+            },
+            deep=True,
         )
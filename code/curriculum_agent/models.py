@@ -35,6 +35,32 @@ class Constraint(BaseModel):
     )
 
 
+# Constraints applied when a lesson plan request does not specify its own.
+# The values are known-good literals, so validation is skipped.
+DEFAULT_CONSTRAINTS = [
+    Constraint.model_construct(
+        name="Privacy Protection",
+        description="No collection or use of personal student information",
+        priority=5,
+    ),
+    Constraint.model_construct(
+        name="Age-Appropriate Language",
+        description="Use classroom-appropriate language suitable for the grade level",
+        priority=5,
+    ),
+    Constraint.model_construct(
+        name="Simplified Vocabulary",
+        description="Use vocabulary appropriate for the specified grade level",
+        priority=4,
+    ),
+    Constraint.model_construct(
+        name="No Personal Information",
+        description="Avoid requesting or referencing personal student information",
+        priority=5,
+    ),
+]
+
+
 class LessonPlanInput(BaseModel):
     """Input parameters for curriculum generation"""
 
@@ -46,31 +72,10 @@ class LessonPlanInput(BaseModel):
         description="Audience knowledge baseline (e.g., 'no prior knowledge of ecosystems')"
     )
     duration_minutes: Optional[int] = Field(
-        default=45, description="Lesson duration in minutes"
+        default=45, gt=0, description="Lesson duration in minutes"
     )
     constraints: List[Constraint] = Field(
-        default_factory=lambda: [
-            Constraint(
-                name="Privacy Protection",
-                description="No collection or use of personal student information",
-                priority=5,
-            ),
-            Constraint(
-                name="Age-Appropriate Language",
-                description="Use classroom-appropriate language suitable for the grade level",
-                priority=5,
-            ),
-            Constraint(
-                name="Simplified Vocabulary",
-                description="Use vocabulary appropriate for the specified grade level",
-                priority=4,
-            ),
-            Constraint(
-                name="No Personal Information",
-                description="Avoid requesting or referencing personal student information",
-                priority=5,
-            ),
-        ]
+        default_factory=lambda: [c.model_copy() for c in DEFAULT_CONSTRAINTS]
     )
 
 
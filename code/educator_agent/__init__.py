@@ -8,14 +8,28 @@ Advanced curriculum planning and educational content generation with:
 - Constraint enforcement
 """
 
-from .curriculum_planner import (
-    generate_prompt,
-    call_llm,
-    validate_plan,
-    plan_curriculum,
-    CURRICULUM_SCHEMA,
-)
-from .slide_generator import create_deck
+import importlib
+
+# Submodules pull in openai, python-pptx and Pillow, so exports are resolved on
+# first access. This keeps `python -m educator_agent --help` and shell
+# completion from paying for imports they never use.
+_LAZY_EXPORTS = {
+    "generate_prompt": "curriculum_planner",
+    "call_llm": "curriculum_planner",
+    "validate_plan": "curriculum_planner",
+    "plan_curriculum": "curriculum_planner",
+    "CURRICULUM_SCHEMA": "curriculum_planner",
+    "create_deck": "slide_generator",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f".{module_name}", __name__)
+    return getattr(module, name)
+
 
 __all__ = [
     "generate_prompt",
@@ -2,8 +2,8 @@
 Thin shell for invoking the Typer-based CLI wizard.
 """
 
-import sys
 from .cli import app
 
 if __name__ == "__main__":
-    sys.exit(app())
+    # Typer runs in standalone mode and exits with the command's status itself
+    app()
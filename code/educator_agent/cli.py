@@ -5,24 +5,30 @@ Provides a user-friendly interactive experience for curriculum planning
 with prompts for all required inputs and optional outputs.
 """
 
-import json
-import tempfile
+import functools
+import hashlib
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+import click
+import orjson
 import typer
-from rich.console import Console
+from rich.console import Console, Group
 from rich.panel import Panel
 from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.prompt import Confirm, Prompt
+from rich.prompt import Confirm, IntPrompt, Prompt
 from rich.table import Table
+from rich.text import Text
 
-from .curriculum_planner import plan_curriculum
-from .slide_generator import create_deck
-from .speaker_notes import generate_notes, save_notes_to_markdown
-from .packager import package_outputs
-from .copilot_pptx import export_to_copilot, CopilotPowerPointError
-from .oer_resource_finder import suggest_oer
+from .defaults import NOTES_MODEL, PLANNER_MODEL
+
+# The planner (openai), the packager and the heavy output modules (python-pptx,
+# Pillow, msal, requests) are imported only when used, so --help and
+# completion start quickly.
 
 app = typer.Typer(
     name="educator-agent",
@@ -33,12 +39,124 @@ app = typer.Typer(
 
 console = Console()
 
+# Models offered by the wizard and accepted by --model; checked before any call
+SUPPORTED_MODELS = (
+    PLANNER_MODEL,
+    NOTES_MODEL,
+    "gpt-4",
+    "gpt-4-turbo",
+    "gpt-3.5-turbo",
+)
+
+# Plans and speaker notes from earlier runs, keyed by a hash of their inputs
+CACHE_DIR = (
+    Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / "educator_agent"
+)
+
+
+def _cache_key(payload: Any) -> str:
+    """Return a stable hash of a JSON-serializable cache payload."""
+    data = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _cache_read(kind: str, key: str) -> Optional[Any]:
+    """Return a cached value, or None when it is missing or unreadable."""
+    try:
+        return orjson.loads((CACHE_DIR / kind / f"{key}.json").read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        return None
+
+
+def _cache_write(kind: str, key: str, value: Any) -> None:
+    """Store a value in the cache; failures only cost a future cache miss."""
+    path = CACHE_DIR / kind / f"{key}.json"
+    try:
+        # Write then rename so concurrent runs never read a partial file
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS))
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def cached_plan_curriculum(
+    params: dict, use_cache: bool = True, refresh: bool = False
+) -> dict:
+    """
+    Plan a curriculum, reusing the result of an identical earlier run.
+
+    Demo plans produced without an API key are never cached, so setting a key
+    later always yields a real plan.
+    """
+    from . import curriculum_planner
+
+    if not use_cache or curriculum_planner.client is None:
+        return curriculum_planner.plan_curriculum(params)
+
+    key = _cache_key(params)
+    if not refresh:
+        plan = _cache_read("plans", key)
+        if plan is not None:
+            return plan
+
+    plan = curriculum_planner.plan_curriculum(params)
+    _cache_write("plans", key, plan)
+    return plan
+
 
-def parse_constraints(constraints_str: str) -> List[str]:
-    """Parse comma-separated constraints string into list."""
+def cached_generate_notes(
+    plan: dict, model: str, use_cache: bool = True, refresh: bool = False
+) -> Dict[int, str]:
+    """Generate speaker notes, reusing those of an identical plan and model."""
+    from . import speaker_notes
+
+    if not use_cache or speaker_notes.get_client() is None:
+        return speaker_notes.generate_notes(plan, model=model)
+
+    key = _cache_key({"plan": plan, "model": model})
+    if not refresh:
+        notes = _cache_read("notes", key)
+        if notes is not None:
+            # JSON object keys are strings; slide indices are ints
+            return {int(index): text for index, text in notes.items()}
+
+    notes = speaker_notes.generate_notes(plan, model=model)
+    _cache_write("notes", key, notes)
+    return notes
+
+
+def _prewarm_planner(model: str) -> None:
+    """Import the planner and open its API connection ahead of the first call."""
+    try:
+        from . import curriculum_planner
+
+        if curriculum_planner.client is not None:
+            # A metadata request leaves a live TLS connection in the pool
+            curriculum_planner.client.models.retrieve(model)
+    except Exception:
+        # Warm-up is best effort; the real call reports any problem
+        pass
+
+
+def _progress() -> Progress:
+    """Create a transient spinner, disabled when stdout is not a terminal."""
+    return Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        transient=True,
+        console=console,
+        disable=not console.is_terminal,
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def parse_constraints(constraints_str: str) -> Tuple[str, ...]:
+    """Parse comma-separated constraints string into an immutable tuple."""
     if not constraints_str:
-        return []
-    return [c.strip() for c in constraints_str.split(",") if c.strip()]
+        return ()
+    return tuple(sys.intern(s) for c in constraints_str.split(",") if (s := c.strip()))
 
 
 def display_welcome():
@@ -85,8 +203,8 @@ def collect_basic_inputs() -> dict:
     # Model selection
     model = Prompt.ask(
         "Which AI model would you like to use?",
-        default="gpt-4o",
-        choices=["gpt-4o", "gpt-4", "gpt-3.5-turbo"],
+        default=PLANNER_MODEL,
+        choices=SUPPORTED_MODELS,
     )
 
     return {
@@ -119,9 +237,7 @@ def collect_output_preferences() -> dict:
 
     # OER resources
     if Confirm.ask("Include OER Commons resources?", default=True):
-        oer_count = typer.prompt(
-            "How many OER resources to fetch?", type=int, default=3
-        )
+        oer_count = IntPrompt.ask("How many OER resources to fetch?", default=3)
         outputs["oer"] = oer_count
 
     # ZIP package
@@ -137,50 +253,63 @@ def collect_output_preferences() -> dict:
     return outputs
 
 
+# Tables accumulate cells in their columns, so each display builds a fresh one
+# from these templates rather than sharing a module-level instance.
+def _content_table() -> Table:
+    """Create the empty content outline table."""
+    table = Table(show_header=True, header_style="bold cyan")
+    table.add_column("Section Title", style="green", width=25)
+    table.add_column("Description", style="white")
+    return table
+
+
+def _parameter_table() -> Table:
+    """Create the empty input review table."""
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Parameter", style="cyan", width=15)
+    table.add_column("Value", style="yellow")
+    return table
+
+
+def _numbered_list(items: List[str]) -> Text:
+    """Render items as one indented, numbered block of plain text."""
+    return Text("\n".join(f"  {i}. {item}" for i, item in enumerate(items, 1)))
+
+
 def display_curriculum_plan(plan: dict) -> None:
     """Display the curriculum plan with rich formatting."""
-    console.print(
-        "\n[bold green]✅ Curriculum Plan Generated Successfully![/bold green]"
-    )
-
-    # Display lesson title
-    console.print(
+    # Collect every renderable and print them together in a single call
+    parts = [
+        "\n[bold green]✅ Curriculum Plan Generated Successfully![/bold green]",
         Panel(
             f"[bold white]{plan['lesson_title']}[/bold white]",
             title="📚 Lesson Title",
             border_style="blue",
-        )
-    )
+        ),
+    ]
 
-    # Display learning objectives
-    console.print("\n[bold blue]🎯 Learning Objectives:[/bold blue]")
-    for i, objective in enumerate(plan["learning_objectives"], 1):
-        console.print(f"  {i}. {objective}")
-
-    # Display content outline
-    console.print("\n[bold blue]📖 Content Outline:[/bold blue]")
-    content_table = Table(show_header=True, header_style="bold cyan")
-    content_table.add_column("Section Title", style="green", width=25)
-    content_table.add_column("Description", style="white")
+    # Learning objectives
+    parts.append("\n[bold blue]🎯 Learning Objectives:[/bold blue]")
+    parts.append(_numbered_list(plan["learning_objectives"]))
 
+    # Content outline
+    parts.append("\n[bold blue]📖 Content Outline:[/bold blue]")
+    content_table = _content_table()
     for section in plan["content_outline"]:
         content_table.add_row(section["title"], section["description"])
 
-    console.print(content_table)
+    parts.append(content_table)
+
+    # Suggested assessments
+    parts.append("\n[bold blue]📝 Suggested Assessments:[/bold blue]")
+    parts.append(_numbered_list(plan["suggested_assessments"]))
 
-    # Display suggested assessments
-    console.print("\n[bold blue]📝 Suggested Assessments:[/bold blue]")
-    for i, assessment in enumerate(plan["suggested_assessments"], 1):
-        console.print(f"  {i}. {assessment}")
+    console.print(Group(*parts))
 
 
 def display_parameters(params: dict) -> None:
     """Display input parameters in a formatted table."""
-    console.print("\n[bold blue]📋 Review Your Inputs:[/bold blue]")
-
-    table = Table(show_header=True, header_style="bold magenta")
-    table.add_column("Parameter", style="cyan", width=15)
-    table.add_column("Value", style="yellow")
+    heading = "\n[bold blue]📋 Review Your Inputs:[/bold blue]"
 
     display_params = {
         "Grade Level": params.get("grade_level", ""),
@@ -188,13 +317,25 @@ def display_parameters(params: dict) -> None:
         "Baseline": params.get("audience_baseline", ""),
         "Duration": params.get("duration", ""),
         "Constraints": ", ".join(params.get("constraints", [])),
-        "Model": params.get("model", "gpt-4o"),
+        "Model": params.get("model", PLANNER_MODEL),
     }
 
+    # Narrow terminals get aligned plain lines, which also skips the table's
+    # column measurement pass
+    if console.size.width < 80:
+        lines = Text()
+        for key, value in display_params.items():
+            lines.append(f"{key:15}", style="cyan")
+            lines.append(f"  {value}\n", style="yellow")
+        lines.rstrip()
+        console.print(Group(heading, lines))
+        return
+
+    table = _parameter_table()
     for key, value in display_params.items():
         table.add_row(key, str(value))
 
-    console.print(table)
+    console.print(Group(heading, table))
 
 
 @app.command()
@@ -212,14 +353,25 @@ def wizard(
     constraints: Optional[str] = typer.Option(
         None, "--constraints", help="Comma-separated constraints"
     ),
-    model: str = typer.Option("gpt-4o", "--model", help="OpenAI model to use"),
+    model: str = typer.Option(
+        PLANNER_MODEL,
+        "--model",
+        click_type=click.Choice(SUPPORTED_MODELS),
+        help="OpenAI model to use",
+    ),
     duration: str = typer.Option("45 minutes", "--duration", help="Lesson duration"),
     pptx: Optional[str] = typer.Option(
         None, "--pptx", help="Generate PowerPoint at path"
     ),
     notes: bool = typer.Option(False, "--notes", help="Generate speaker notes"),
+    notes_model: str = typer.Option(
+        NOTES_MODEL,
+        "--notes-model",
+        click_type=click.Choice(SUPPORTED_MODELS),
+        help="OpenAI model to use for speaker notes",
+    ),
     oer: Optional[int] = typer.Option(
-        None, "--oer", help="Number of OER resources to fetch"
+        None, "--oer", min=1, help="Number of OER resources to fetch"
     ),
     zip_path: Optional[str] = typer.Option(
         None, "--zip", help="Package outputs into ZIP"
@@ -231,215 +383,276 @@ def wizard(
     quiet: bool = typer.Option(
         False, "--quiet", "-q", help="Suppress progress messages"
     ),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Always call the model, bypassing cached results"
+    ),
+    refresh_cache: bool = typer.Option(
+        False,
+        "--refresh-cache",
+        help="Regenerate and overwrite cached plans and notes",
+    ),
 ):
     """
     Generate curriculum plans with AI assistance.
 
     Run without arguments for interactive wizard mode, or use flags for direct execution.
     """
+    if not non_interactive and not any([grade, subject]):
+        params, outputs = _collect_interactive_inputs(model)
+    else:
+        # Non-interactive mode using flags
+        if not grade or not subject:
+            console.print(
+                "[red]Error: --grade and --subject are required in non-interactive mode[/red]"
+            )
+            raise typer.Exit(1)
+
+        params = {
+            "grade_level": grade,
+            "subject": subject,
+            "audience_baseline": baseline or "grade-appropriate prior knowledge",
+            "constraints": parse_constraints(
+                constraints or "age-appropriate,privacy-protecting"
+            ),
+            "duration": duration,
+            "model": model,
+        }
+
+        outputs = {
+            "pptx": Path(pptx) if pptx else None,
+            "notes": notes,
+            "notes_model": notes_model,
+            "oer": oer,
+            "zip": Path(zip_path) if zip_path else None,
+            "copilot": copilot,
+        }
+
     try:
-        if not non_interactive and not any([grade, subject]):
-            # Interactive wizard mode
-            display_welcome()
-
-            # Collect inputs interactively
-            params = collect_basic_inputs()
-            outputs = collect_output_preferences()
-
-            # Display review
-            display_parameters(params)
-
-            if not Confirm.ask(
-                "\n[bold yellow]Proceed with curriculum generation?[/bold yellow]",
-                default=True,
-            ):
-                console.print("[yellow]Operation cancelled.[/yellow]")
-                raise typer.Exit(1)
+        _generate_outputs(
+            params,
+            outputs,
+            json_only=json_only,
+            quiet=quiet,
+            use_cache=not no_cache,
+            refresh_cache=refresh_cache,
+        )
+
+    except typer.Exit:
+        raise
+
+    except KeyboardInterrupt:
+        console.print("\n[yellow]⚠️  Operation cancelled by user[/yellow]")
+        raise typer.Exit(1)
 
+    # requests' errors are OSErrors too, so only catch the file-system ones
+    except (PermissionError, IsADirectoryError) as e:
+        console.print(f"\n[bold red]❌ Could not write output file: {e}[/bold red]")
+        raise typer.Exit(1)
+
+    except Exception as e:
+        console.print(f"\n[bold red]❌ Error: {e}[/bold red]")
+        raise typer.Exit(1)
+
+
+def _collect_interactive_inputs(model: str) -> Tuple[dict, dict]:
+    """Run the interactive prompts and return the parameters and outputs."""
+    # Warm up the planner while the user answers the prompts, which takes far
+    # longer than the import and handshake
+    threading.Thread(target=_prewarm_planner, args=(model,), daemon=True).start()
+    display_welcome()
+
+    try:
+        params = collect_basic_inputs()
+        outputs = collect_output_preferences()
+
+        # Display review
+        display_parameters(params)
+
+        proceed = Confirm.ask(
+            "\n[bold yellow]Proceed with curriculum generation?[/bold yellow]",
+            default=True,
+        )
+    except KeyboardInterrupt:
+        console.print("\n[yellow]⚠️  Operation cancelled by user[/yellow]")
+        raise typer.Exit(1)
+
+    if not proceed:
+        console.print("[yellow]Operation cancelled.[/yellow]")
+        raise typer.Exit(1)
+
+    return params, outputs
+
+
+def _generate_outputs(
+    params: dict,
+    outputs: dict,
+    json_only: bool,
+    quiet: bool,
+    use_cache: bool,
+    refresh_cache: bool,
+) -> None:
+    """Generate the plan and every requested output file."""
+    # Fast path for scripted use: no spinner, no formatted output
+    if json_only:
+        plan = cached_plan_curriculum(params, use_cache, refresh_cache)
+        data = orjson.dumps(
+            plan, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE
+        )
+        # Text-only streams (e.g. a StringIO) have no binary buffer
+        buffer = getattr(sys.stdout, "buffer", None)
+        sys.stdout.flush()
+        if buffer is None:
+            sys.stdout.write(data.decode())
+            sys.stdout.flush()
         else:
-            # Non-interactive mode using flags
-            if not grade or not subject:
-                console.print(
-                    "[red]Error: --grade and --subject are required in non-interactive mode[/red]"
-                )
-                raise typer.Exit(1)
+            buffer.write(data)
+            buffer.flush()
+        return
+
+    # A Copilot export without credentials is bound to fail, so check them
+    # before paying for the plan
+    if outputs.get("copilot"):
+        from .copilot_pptx import _check_copilot_credentials, CopilotPowerPointError
+
+        try:
+            _check_copilot_credentials()
+        except CopilotPowerPointError as e:
+            console.print(f"\n[bold red]❌ Copilot export failed: {e}[/bold red]")
+            raise typer.Exit(1)
+
+    # One live display spans the whole pipeline; each stage adds a spinner
+    # task and removes it when done, and messages print above the display
+    with _progress() as progress:
+        task = progress.add_task(
+            f"Generating curriculum plan using {params['model']}...", total=None
+        )
+        plan = cached_plan_curriculum(params, use_cache, refresh_cache)
+        progress.remove_task(task)
 
-            params = {
-                "grade_level": grade,
-                "subject": subject,
-                "audience_baseline": baseline or "grade-appropriate prior knowledge",
-                "constraints": parse_constraints(
-                    constraints or "age-appropriate,privacy-protecting"
-                ),
-                "duration": duration,
-                "model": model,
-            }
-
-            outputs = {
-                "pptx": Path(pptx) if pptx else None,
-                "notes": notes,
-                "oer": oer,
-                "zip": Path(zip_path) if zip_path else None,
-                "copilot": copilot,
-            }
-
-        # Generate curriculum plan
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            transient=True,
-        ) as progress:
-            task = progress.add_task(
-                f"Generating curriculum plan using {params['model']}...", total=None
-            )
-            plan = plan_curriculum(params)
-            progress.update(task, completed=100)
-
-        # Display results unless quiet or json-only
-        if json_only:
-            print(json.dumps(plan, indent=2))
-            return
-        elif not quiet:
+        # Display results unless quiet
+        if not quiet:
             display_curriculum_plan(plan)
 
-        # Handle OER resources
-        oer_resources = []
-        if outputs.get("oer"):
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                transient=True,
-            ) as progress:
-                task = progress.add_task(
-                    f"Fetching {outputs['oer']} OER Commons resources for '{params['subject']}'...",
-                    total=None,
-                )
-                oer_resources = suggest_oer(params["subject"], count=outputs["oer"])
-                progress.update(task, completed=100)
-
-            if oer_resources and not quiet:
-                console.print("\n[bold blue]📚 OER Commons Resources:[/bold blue]")
-                for i, url in enumerate(oer_resources, 1):
-                    console.print(f"  {i}. {url}")
-            elif not oer_resources and not quiet:
-                console.print(
-                    "\n[yellow]⚠️  No OER resources found for this topic[/yellow]"
-                )
-
         # Track generated files
+        oer_resources = []
         generated_files = {"pptx_path": None, "notes_path": None}
 
-        # Generate PowerPoint if requested
-        if outputs.get("pptx"):
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                transient=True,
-            ) as progress:
-                task = progress.add_task(
-                    "Generating PowerPoint presentation...", total=None
-                )
-                create_deck(plan, outputs["pptx"])
-                generated_files["pptx_path"] = outputs["pptx"]
-                progress.update(task, completed=100)
+        # OER lookup, deck and speaker notes only read the finished plan, so
+        # run them concurrently and overlap the HTTP, LLM and python-pptx work
+        if outputs.get("oer") or outputs.get("pptx") or outputs.get("notes"):
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                oer_future = deck_future = notes_future = None
 
-            if not quiet:
+                if outputs.get("oer"):
+                    from .oer_resource_finder import suggest_oer
+
+                    oer_task = progress.add_task(
+                        f"Fetching {outputs['oer']} OER Commons resources for '{params['subject']}'...",
+                        total=None,
+                    )
+                    oer_future = executor.submit(
+                        suggest_oer, params["subject"], count=outputs["oer"]
+                    )
+
+                if outputs.get("pptx"):
+                    from .slide_generator import create_deck
+
+                    deck_task = progress.add_task(
+                        "Generating PowerPoint presentation...", total=None
+                    )
+                    deck_future = executor.submit(create_deck, plan, outputs["pptx"])
+
+                if outputs.get("notes"):
+                    from .speaker_notes import save_notes_to_markdown
+
+                    notes_task = progress.add_task(
+                        "Generating speaker notes...", total=None
+                    )
+                    notes_future = executor.submit(
+                        cached_generate_notes,
+                        plan,
+                        outputs.get("notes_model", NOTES_MODEL),
+                        use_cache,
+                        refresh_cache,
+                    )
+
+                if oer_future is not None:
+                    oer_resources = oer_future.result()
+                    progress.remove_task(oer_task)
+
+                if deck_future is not None:
+                    deck_future.result()
+                    generated_files["pptx_path"] = outputs["pptx"]
+                    progress.remove_task(deck_task)
+
+                # The notes file links the OER resources, so it is written last
+                if notes_future is not None:
+                    md_path = save_notes_to_markdown(
+                        notes_future.result(),
+                        plan["lesson_title"],
+                        oer_resources=oer_resources,
+                    )
+                    generated_files["notes_path"] = Path(md_path)
+                    progress.remove_task(notes_task)
+
+            if outputs.get("oer") and not quiet:
+                if oer_resources:
+                    console.print("\n[bold blue]📚 OER Commons Resources:[/bold blue]")
+                    for i, url in enumerate(oer_resources, 1):
+                        console.print(f"  {i}. {url}")
+                else:
+                    console.print(
+                        "\n[yellow]⚠️  No OER resources found for this topic[/yellow]"
+                    )
+            if not quiet and generated_files["pptx_path"]:
                 console.print(
                     f"[bold green]✅ Deck saved to {outputs['pptx']}[/bold green]"
                 )
-
-        # Generate speaker notes if requested
-        if outputs.get("notes"):
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                transient=True,
-            ) as progress:
-                task = progress.add_task("Generating speaker notes...", total=None)
-                notes = generate_notes(plan, model=params["model"])
-                md_path = save_notes_to_markdown(
-                    notes, plan["lesson_title"], oer_resources=oer_resources
-                )
-                generated_files["notes_path"] = Path(md_path)
-                progress.update(task, completed=100)
-
-            if not quiet:
+            if not quiet and generated_files["notes_path"]:
                 console.print(
                     f"[bold green]✅ Speaker notes saved to {md_path}[/bold green]"
                 )
 
         # Package outputs into ZIP if requested
         if outputs.get("zip"):
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                transient=True,
-            ) as progress:
-                task = progress.add_task(
-                    "Packaging outputs into ZIP file...", total=None
-                )
-
-                # Create temporary JSON file for the plan
-                temp_json = None
-                with tempfile.NamedTemporaryFile(
-                    mode="w", suffix=".json", delete=False
-                ) as f:
-                    json.dump(plan, f, indent=2)
-                    temp_json = Path(f.name)
-
-                try:
-                    package_path = package_outputs(
-                        plan_json_path=temp_json,
-                        pptx_path=generated_files["pptx_path"],
-                        notes_path=generated_files["notes_path"],
-                        out_zip=outputs["zip"],
-                        plan_data=plan,
-                    )
-                    progress.update(task, completed=100)
-
-                    if not quiet:
-                        console.print(
-                            f"[bold green]✅ Package saved to {package_path}[/bold green]"
-                        )
+            from .packager import package_outputs
+
+            task = progress.add_task("Packaging outputs into ZIP file...", total=None)
+            package_path = package_outputs(
+                pptx_path=generated_files["pptx_path"],
+                notes_path=generated_files["notes_path"],
+                out_zip=outputs["zip"],
+                plan_data=plan,
+            )
+            progress.remove_task(task)
 
-                finally:
-                    # Clean up temporary JSON file
-                    if temp_json and temp_json.exists():
-                        temp_json.unlink()
+            if not quiet:
+                console.print(
+                    f"[bold green]✅ Package saved to {package_path}[/bold green]"
+                )
 
         # Export to Microsoft Copilot if requested
         if outputs.get("copilot"):
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                transient=True,
-            ) as progress:
-                task = progress.add_task(
-                    "Exporting to Microsoft 365 OneDrive with Copilot...", total=None
-                )
-                share_url = export_to_copilot(plan)
-                progress.update(task, completed=100)
-
-                if not quiet:
-                    console.print(
-                        "[bold green]✅ Presentation exported to OneDrive[/bold green]"
-                    )
-                    console.print(f"[bold blue]🔗 Share URL: {share_url}[/bold blue]")
+            from .copilot_pptx import export_to_copilot, CopilotPowerPointError
 
-        if not quiet:
-            console.print("\n[bold green]🎉 Task completed successfully![/bold green]")
-
-    except KeyboardInterrupt:
-        console.print("\n[yellow]⚠️  Operation cancelled by user[/yellow]")
-        raise typer.Exit(1)
+            task = progress.add_task(
+                "Exporting to Microsoft 365 OneDrive with Copilot...", total=None
+            )
+            try:
+                share_url = export_to_copilot(plan)
+            except CopilotPowerPointError as e:
+                console.print(f"\n[bold red]❌ Copilot export failed: {e}[/bold red]")
+                raise typer.Exit(1)
+            progress.remove_task(task)
 
-    except CopilotPowerPointError as e:
-        console.print(f"\n[bold red]❌ Copilot export failed: {e}[/bold red]")
-        raise typer.Exit(1)
+            if not quiet:
+                console.print(
+                    "[bold green]✅ Presentation exported to OneDrive[/bold green]"
+                )
+                console.print(f"[bold blue]🔗 Share URL: {share_url}[/bold blue]")
 
-    except Exception as e:
-        console.print(f"\n[bold red]❌ Error: {e}[/bold red]")
-        raise typer.Exit(1)
+    if not quiet:
+        console.print("\n[bold green]🎉 Task completed successfully![/bold green]")
 
 
 if __name__ == "__main__":
@@ -5,14 +5,52 @@ Provides functionality to create PowerPoint presentations in OneDrive using
 Microsoft Graph API and Copilot features for automated slide generation.
 """
 
+import functools
 import os
-import requests
-from typing import Dict, Any
-from dotenv import load_dotenv
-import msal
+from typing import Dict, Any, Optional, Tuple
 
-# Load environment variables
-load_dotenv()
+# msal, requests and python-dotenv are imported on first use so that loading
+# this module (e.g. to check credentials) stays cheap.
+
+
+@functools.lru_cache(maxsize=None)
+def _load_env() -> None:
+    """Load variables from a .env file, once per process."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+
+@functools.lru_cache(maxsize=None)
+def _graph_session():
+    """Return the shared HTTP session used for every Graph API call."""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    # One pooled session keeps the TLS connection to Graph alive across the
+    # drive lookup, upload and sharing requests of an export
+    session = requests.Session()
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504],
+        raise_on_status=False,
+    )
+    session.mount(
+        "https://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry)
+    )
+    return session
+
+
+def _auth_headers(
+    access_token: str, content_type: Optional[str] = None
+) -> Dict[str, str]:
+    """Build per-request Graph headers, keeping the token off the shared session."""
+    headers = {"Authorization": f"Bearer {access_token}"}
+    if content_type:
+        headers["Content-Type"] = content_type
+    return headers
 
 
 class CopilotPowerPointError(Exception):
@@ -21,16 +59,29 @@ class CopilotPowerPointError(Exception):
     pass
 
 
-def get_access_token() -> str:
+@functools.lru_cache(maxsize=4)
+def _msal_app(client_id: str, tenant_id: str, client_secret: str):
+    """Return the MSAL client app for a set of credentials, built once."""
+    import msal
+
+    return msal.ConfidentialClientApplication(
+        client_id=client_id,
+        client_credential=client_secret,
+        authority=f"https://login.microsoftonline.com/{tenant_id}",
+    )
+
+
+def _check_copilot_credentials() -> Tuple[str, str, str]:
     """
-    Authenticate with Microsoft Graph API using client credentials flow.
+    Read the Microsoft 365 app credentials without contacting Azure AD.
 
     Returns:
-        Access token for Graph API calls
+        Tuple of (client_id, tenant_id, client_secret)
 
     Raises:
-        CopilotPowerPointError: If authentication fails or credentials are missing
+        CopilotPowerPointError: If any of the credentials is missing
     """
+    _load_env()
     client_id = os.getenv("MS_CLIENT_ID")
     tenant_id = os.getenv("MS_TENANT_ID")
     client_secret = os.getenv("MS_CLIENT_SECRET")
@@ -41,17 +92,27 @@ def get_access_token() -> str:
             "MS_TENANT_ID, and MS_CLIENT_SECRET environment variables."
         )
 
+    return client_id, tenant_id, client_secret
+
+
+def get_access_token() -> str:
+    """
+    Authenticate with Microsoft Graph API using client credentials flow.
+
+    Returns:
+        Access token for Graph API calls
+
+    Raises:
+        CopilotPowerPointError: If authentication fails or credentials are missing
+    """
+    client_id, tenant_id, client_secret = _check_copilot_credentials()
+
     # Required scopes for PowerPoint and OneDrive operations
     scopes = ["https://graph.microsoft.com/.default"]
 
-    # Create MSAL client app
-    app = msal.ConfidentialClientApplication(
-        client_id=client_id,
-        client_credential=client_secret,
-        authority=f"https://login.microsoftonline.com/{tenant_id}",
-    )
-
-    # Acquire token using client credentials flow
+    # Acquire token using client credentials flow; a still-valid token from
+    # an earlier export is served from the app's in-memory cache
+    app = _msal_app(client_id, tenant_id, client_secret)
     result = app.acquire_token_for_client(scopes=scopes)
 
     if "access_token" not in result:
@@ -77,10 +138,10 @@ def create_presentation_via_copilot(
     Raises:
         CopilotPowerPointError: If presentation creation fails
     """
-    headers = {
-        "Authorization": f"Bearer {access_token}",
-        "Content-Type": "application/json",
-    }
+    import orjson
+    import requests
+
+    session = _graph_session()
 
     # Prepare presentation content based on curriculum plan
     lesson_title = plan.get("lesson_title", "Curriculum Presentation")
@@ -88,36 +149,34 @@ def create_presentation_via_copilot(
     content_outline = plan.get("content_outline", [])
     suggested_assessments = plan.get("suggested_assessments", [])
 
-    # Build slide content
-    slides_content = []
-
-    # Title slide
-    title_slide = {
-        "slideType": "title",
-        "title": lesson_title,
-        "content": "Learning Objectives:\n"
-        + "\n".join(f"• {obj}" for obj in learning_objectives),
-    }
-    slides_content.append(title_slide)
-
-    # Content slides
-    for i, section in enumerate(content_outline, 1):
-        content_slide = {
+    # Build slide content: a title slide followed by one slide per section
+    slides_content = [
+        {
+            "slideType": "title",
+            "title": lesson_title,
+            "content": "Learning Objectives:\n"
+            + "\n".join(f"• {obj}" for obj in learning_objectives),
+        }
+    ]
+    slides_content.extend(
+        {
             "slideType": "content",
             "title": section.get("title", f"Content Section {i}"),
             "content": section.get("description", ""),
         }
-        slides_content.append(content_slide)
+        for i, section in enumerate(content_outline, 1)
+    )
 
     # Assessment slide
     if suggested_assessments:
-        assessment_slide = {
-            "slideType": "content",
-            "title": "Assessments",
-            "content": "Suggested Assessment Methods:\n"
-            + "\n".join(f"• {assessment}" for assessment in suggested_assessments),
-        }
-        slides_content.append(assessment_slide)
+        slides_content.append(
+            {
+                "slideType": "content",
+                "title": "Assessments",
+                "content": "Suggested Assessment Methods:\n"
+                + "\n".join(f"• {assessment}" for assessment in suggested_assessments),
+            }
+        )
 
     # Prepare request payload for Copilot PowerPoint creation
     presentation_data = {
@@ -134,8 +193,11 @@ def create_presentation_via_copilot(
     )
 
     try:
-        response = requests.post(
-            copilot_url, headers=headers, json=presentation_data, timeout=30
+        response = session.post(
+            copilot_url,
+            headers=_auth_headers(access_token, "application/json"),
+            data=orjson.dumps(presentation_data),
+            timeout=30,
         )
 
         if response.status_code == 201 or response.status_code == 200:
@@ -145,17 +207,42 @@ def create_presentation_via_copilot(
         print(
             f"Copilot endpoint returned {response.status_code}, falling back to standard PowerPoint creation..."
         )
-        return create_presentation_fallback(plan, access_token, headers)
+        return create_presentation_fallback(plan, access_token)
 
     except requests.exceptions.RequestException as e:
         print(
             f"Copilot endpoint failed: {e}, falling back to standard PowerPoint creation..."
         )
-        return create_presentation_fallback(plan, access_token, headers)
+        return create_presentation_fallback(plan, access_token)
+
+
+def _outline_body(plan: Dict[str, Any], lesson_title: str) -> bytes:
+    """Render the plan as the UTF-8 text outline uploaded by the fallback."""
+    # Create a basic PowerPoint file by uploading a minimal PPTX structure
+    # For simplicity, we'll create a text file with the presentation content
+    # In a real implementation, you would create an actual PPTX file
+
+    suggested_assessments = plan.get("suggested_assessments", [])
+
+    # Collect the pieces and join once, then encode once for the upload
+    parts = [f"# {lesson_title}\n\n## Learning Objectives\n"]
+    parts.extend(f"• {obj}\n" for obj in plan.get("learning_objectives", []))
+
+    parts.append("\n## Content Outline\n")
+    parts.extend(
+        f"\n### {section.get('title', 'Section')}\n{section.get('description', '')}\n"
+        for section in plan.get("content_outline", [])
+    )
+
+    if suggested_assessments:
+        parts.append("\n## Assessments\n")
+        parts.extend(f"• {assessment}\n" for assessment in suggested_assessments)
+
+    return "".join(parts).encode("utf-8")
 
 
 def create_presentation_fallback(
-    plan: Dict[str, Any], access_token: str, headers: Dict[str, str]
+    plan: Dict[str, Any], access_token: str
 ) -> Dict[str, Any]:
     """
     Fallback method to create PowerPoint presentation using standard Graph API.
@@ -163,7 +250,6 @@ def create_presentation_fallback(
     Args:
         plan: Curriculum plan dictionary
         access_token: Microsoft Graph API access token
-        headers: HTTP headers with authorization
 
     Returns:
         Dictionary with presentation metadata including share URL
@@ -171,14 +257,16 @@ def create_presentation_fallback(
     Raises:
         CopilotPowerPointError: If presentation creation fails
     """
+    session = _graph_session()
     lesson_title = plan.get("lesson_title", "Curriculum Presentation")
 
     # Create a new PowerPoint file in OneDrive
     file_name = f"{lesson_title.replace(' ', '_')}_Presentation.pptx"
 
-    # First, get the user's drive ID
-    drive_response = requests.get(
-        "https://graph.microsoft.com/v1.0/me/drive", headers=headers, timeout=10
+    drive_response = session.get(
+        "https://graph.microsoft.com/v1.0/me/drive",
+        headers=_auth_headers(access_token),
+        timeout=10,
     )
 
     if drive_response.status_code != 200:
@@ -186,41 +274,13 @@ def create_presentation_fallback(
             f"Failed to access OneDrive: {drive_response.status_code}"
         )
 
-    # Create a basic PowerPoint file by uploading a minimal PPTX structure
-    # For simplicity, we'll create a text file with the presentation content
-    # In a real implementation, you would create an actual PPTX file
-
-    content_text = f"""# {lesson_title}
-
-## Learning Objectives
-"""
-
-    for obj in plan.get("learning_objectives", []):
-        content_text += f"• {obj}\n"
-
-    content_text += "\n## Content Outline\n"
-
-    for section in plan.get("content_outline", []):
-        content_text += f"\n### {section.get('title', 'Section')}\n"
-        content_text += f"{section.get('description', '')}\n"
-
-    if plan.get("suggested_assessments"):
-        content_text += "\n## Assessments\n"
-        for assessment in plan["suggested_assessments"]:
-            content_text += f"• {assessment}\n"
-
     # Upload the file to OneDrive
     upload_url = f"https://graph.microsoft.com/v1.0/me/drive/root:/{file_name}:/content"
 
-    upload_headers = {
-        "Authorization": f"Bearer {access_token}",
-        "Content-Type": "text/plain",
-    }
-
-    upload_response = requests.put(
+    upload_response = session.put(
         upload_url,
-        headers=upload_headers,
-        data=content_text.encode("utf-8"),
+        headers=_auth_headers(access_token, "text/plain"),
+        data=_outline_body(plan, lesson_title),
         timeout=30,
     )
 
@@ -235,10 +295,10 @@ def create_presentation_fallback(
     # Create a sharing link
     sharing_payload = {"type": "view", "scope": "organization"}
 
-    sharing_response = requests.post(
+    sharing_response = session.post(
         f"https://graph.microsoft.com/v1.0/me/drive/items/{file_id}/createLink",
-        headers=headers,
         json=sharing_payload,
+        headers=_auth_headers(access_token),
         timeout=10,
     )
 
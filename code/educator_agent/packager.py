@@ -5,12 +5,32 @@ Provides functionality to package lesson plans, presentations, and notes into
 a single ZIP file for easy distribution and archiving.
 """
 
-import json
 import zipfile
+
+import orjson
 from pathlib import Path
 from typing import Optional, Dict, Any
 from datetime import datetime
 
+_README_FOOTER = """
+## Package Contents
+
+This curriculum package contains the following files:
+
+- **lesson_plan.json** - Complete lesson plan in JSON format
+- **presentation.pptx** - PowerPoint presentation slides (if generated)
+- **notes.txt** - Additional notes and materials (if provided)
+- **README.md** - This documentation file
+
+## Usage
+
+1. Review the lesson plan in `lesson_plan.json` for detailed curriculum structure
+2. Use `presentation.pptx` for classroom presentation
+3. Refer to `notes.txt` for additional teaching materials and guidance
+
+Generated by Educator Agent - AI-powered curriculum planning tool.
+"""
+
 
 def create_readme_content(plan: Dict[str, Any]) -> str:
     """
@@ -27,7 +47,7 @@ def create_readme_content(plan: Dict[str, Any]) -> str:
     subject = plan.get("subject", "Unknown Subject")
     objectives = plan.get("learning_objectives", [])
 
-    readme_content = f"""# {lesson_title}
+    header = f"""# {lesson_title}
 
 ## Course Information
 - **Grade Level**: {grade_level}
@@ -37,29 +57,11 @@ def create_readme_content(plan: Dict[str, Any]) -> str:
 ## Learning Objectives
 """
 
-    for i, objective in enumerate(objectives, 1):
-        readme_content += f"{i}. {objective}\n"
-
-    readme_content += """
-## Package Contents
-
-This curriculum package contains the following files:
-
-- **lesson_plan.json** - Complete lesson plan in JSON format
-- **presentation.pptx** - PowerPoint presentation slides (if generated)
-- **notes.txt** - Additional notes and materials (if provided)
-- **README.md** - This documentation file
-
-## Usage
-
-1. Review the lesson plan in `lesson_plan.json` for detailed curriculum structure
-2. Use `presentation.pptx` for classroom presentation
-3. Refer to `notes.txt` for additional teaching materials and guidance
-
-Generated by Educator Agent - AI-powered curriculum planning tool.
-"""
-
-    return readme_content
+    # Build the document in one join; the package description never changes
+    numbered = "".join(
+        f"{i}. {objective}\n" for i, objective in enumerate(objectives, 1)
+    )
+    return "".join((header, numbered, _README_FOOTER))
 
 
 def package_outputs(
@@ -77,7 +79,8 @@ def package_outputs(
         pptx_path: Path to the PowerPoint presentation file
         notes_path: Path to additional notes file
         out_zip: Path for the output ZIP file
-        plan_data: Optional curriculum plan data for README generation
+        plan_data: Optional curriculum plan data for README generation. When
+            no plan_json_path is given it is also written as lesson_plan.json
 
     Returns:
         Absolute path to the created ZIP file
@@ -121,6 +124,13 @@ def package_outputs(
             zipf.write(file_path, archive_name)
             print(f"Added {archive_name} to package")
 
+        # Serialize the plan straight into the archive when no file was given
+        if plan_data and not plan_json_path:
+            zipf.writestr(
+                "lesson_plan.json", orjson.dumps(plan_data, option=orjson.OPT_INDENT_2)
+            )
+            print("Added lesson_plan.json to package")
+
         # Create and add README
         readme_content = ""
         if plan_data:
@@ -128,10 +138,9 @@ def package_outputs(
         elif plan_json_path and plan_json_path.exists():
             # Try to load plan data from JSON file
             try:
-                with open(plan_json_path, "r", encoding="utf-8") as f:
-                    plan_data = json.load(f)
+                plan_data = orjson.loads(plan_json_path.read_bytes())
                 readme_content = create_readme_content(plan_data)
-            except (json.JSONDecodeError, IOError) as e:
+            except (orjson.JSONDecodeError, IOError) as e:
                 print(f"Warning: Could not read plan data for README: {e}")
                 readme_content = "# Curriculum Package\n\nGenerated by Educator Agent"
         else:
@@ -181,8 +190,7 @@ def main():
 
         # Create test files
         json_file = temp_path / "test_plan.json"
-        with open(json_file, "w") as f:
-            json.dump(sample_plan, f, indent=2)
+        json_file.write_bytes(orjson.dumps(sample_plan, option=orjson.OPT_INDENT_2))
 
         notes_file = temp_path / "test_notes.txt"
         with open(notes_file, "w") as f:
@@ -6,38 +6,120 @@ Provides:
 - enforce_constraints: Apply cleaning to all user-visible strings in curriculum JSON
 
 Uses better-profanity for profanity filtering and regex for PII detection.
+Most text is free of profanity and PII, so compiled prefilters let it skip
+better-profanity and the ordered per-class PII passes.
 """
 
+import functools
 import re
-from typing import Dict, Any, Union
+from typing import Dict, Any, Optional, Tuple, Union
 from better_profanity import profanity
 
+# Every PII pattern needs a digit, an "@" or two capitalized words in a row;
+# text without any of them is skipped by the PII pass
+_PII_QUICK_CHECK = re.compile(r"[@\d]|[A-Z][a-z]+\s+[A-Z]")
+
+# PII detection patterns, compiled once at import and shared by every sanitizer
+_PII_PATTERNS = {
+    # Full names (first + last name pattern)
+    "names": re.compile(r"\b[A-Z][a-z]+\s+[A-Z][a-z]+\b"),
+    # Phone numbers (various formats)
+    "phones": re.compile(
+        r"(\+?1[-.\s]?)?\(?([0-9]{3})\)?[-.\s]?([0-9]{3})[-.\s]?([0-9]{4})"
+    ),
+    # Email addresses
+    "emails": re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b"),
+    # Social Security Numbers
+    "ssn": re.compile(r"\b\d{3}-?\d{2}-?\d{4}\b"),
+    # Credit card numbers (basic pattern)
+    "credit_cards": re.compile(r"\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b"),
+}
+
+# All PII classes in one alternation, used only to find out whether a string
+# holds any PII at all. Redaction itself must run the classes one after the
+# other: a single alternation lets a match from one class consume characters
+# an adjacent match of another class needs, and that PII would leak
+_PII_RE = re.compile(
+    "|".join(
+        f"(?P<{name}>{pattern.pattern})" for name, pattern in _PII_PATTERNS.items()
+    )
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _profanity_prefilter() -> Tuple[re.Pattern, re.Pattern, re.Pattern]:
+    """
+    Build one regex per word shape that finds any possible censor word.
+
+    better-profanity compares every word of the text against each of its
+    ~900 censor words, which dominates sanitizing. The combined patterns
+    match a superset of what it censors, so text they do not match is
+    returned unchanged without calling it.
+
+    Built on first use and shared by every sanitizer, so the censor words
+    are loaded and compiled once per process.
+    """
+    profanity.load_censor_words()
+    allowed = profanity.ALLOWED_CHARACTERS
+
+    def variants(char: str) -> str:
+        options = profanity.CHARS_MAPPING.get(char, (char,))
+        return "[" + "".join(re.escape(o) for o in options) + "]"
+
+    def alternation(words) -> re.Pattern:
+        # Words sharing a prefix share its branch, which keeps both
+        # compiling and searching the pattern cheap
+        trie: Dict[str, dict] = {}
+        for word in words:
+            node = trie
+            for char in word:
+                node = node.setdefault(char, {})
+            node[""] = {}
+
+        def branch(node: Dict[str, dict]) -> str:
+            alts = [
+                variants(char) + branch(child)
+                for char, child in sorted(node.items())
+                if char
+            ]
+            if not alts:
+                return ""
+            body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+            return f"(?:{body})?" if "" in node else body
+
+        return re.compile(branch(trie) if trie else "(?!)")
+
+    words = [str(word) for word in profanity.CENSOR_WORDSET]
+    plain = {word for word in words if all(char in allowed for char in word)}
+
+    # Plain words can also be spelled across separators ("f u c k"), so
+    # they are searched in the text with every separator removed
+    return (
+        alternation(plain),
+        alternation(set(words) - plain),
+        re.compile("[^" + "".join(re.escape(char) for char in sorted(allowed)) + "]+"),
+    )
+
 
 class ContentSanitizer:
     """Content sanitizer for educational materials."""
 
     def __init__(self):
         """Initialize the sanitizer with profanity filter."""
-        # Initialize profanity filter
-        profanity.load_censor_words()
-
-        # PII detection patterns
-        self.patterns = {
-            # Full names (first + last name pattern)
-            "names": re.compile(r"\b[A-Z][a-z]+\s+[A-Z][a-z]+\b"),
-            # Phone numbers (various formats)
-            "phones": re.compile(
-                r"(\+?1[-.\s]?)?\(?([0-9]{3})\)?[-.\s]?([0-9]{3})[-.\s]?([0-9]{4})"
-            ),
-            # Email addresses
-            "emails": re.compile(
-                r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b"
-            ),
-            # Social Security Numbers
-            "ssn": re.compile(r"\b\d{3}-?\d{2}-?\d{4}\b"),
-            # Credit card numbers (basic pattern)
-            "credit_cards": re.compile(r"\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b"),
-        }
+        # Shared compiled patterns; nothing is recompiled per instance
+        self.patterns = _PII_PATTERNS
+        self._pii_re = _PII_RE
+
+    def _may_contain_profanity(self, text: str) -> bool:
+        """Return False only if better-profanity would leave text unchanged."""
+        # The censor words are loaded on first use, so importing this module
+        # (e.g. via the planner) stays cheap
+        words_re, phrases_re, separators_re = _profanity_prefilter()
+
+        lowered = text.lower()
+        if phrases_re.search(lowered):
+            return True
+        return words_re.search(separators_re.sub("", lowered)) is not None
 
     def clean_text(self, text: str) -> str:
         """
@@ -52,37 +134,85 @@ class ContentSanitizer:
         if not isinstance(text, str):
             return text
 
-        # First, remove profanity
-        cleaned_text = profanity.censor(text)
+        # Clean text needs only the PII pass; censoring must come first
+        # otherwise, as masking a word can break up a name match
+        if not self._may_contain_profanity(text):
+            return self._redact_pii(text)
 
-        # Then replace PII patterns with [REDACTED]
-        for pattern_name, pattern in self.patterns.items():
-            cleaned_text = pattern.sub("[REDACTED]", cleaned_text)
+        # Remove profanity, then replace PII patterns with [REDACTED]
+        return self._redact_pii(profanity.censor(text))
 
-        return cleaned_text
+    def _redact_pii(self, text: str) -> str:
+        """Replace PII with [REDACTED], skipping text that cannot contain any."""
+        if not _PII_QUICK_CHECK.search(text) or not self._pii_re.search(text):
+            return text
+        for pattern in self.patterns.values():
+            text = pattern.sub("[REDACTED]", text)
+        return text
 
     def _clean_dict_recursively(
-        self, data: Union[Dict, list, str, Any]
+        self,
+        data: Union[Dict, list, str, Any],
+        cleaned: Optional[Dict[str, str]] = None,
     ) -> Union[Dict, list, str, Any]:
         """
-        Recursively clean all string values in a dictionary or list structure.
+        Clean all string values in a dictionary or list structure.
+
+        The structure is walked with an explicit stack rather than recursion,
+        so deep nesting cannot hit the recursion limit. Each container is
+        copied once; containers referenced again, including cycles, map to
+        that same copy.
 
         Args:
             data: Data structure to clean
+            cleaned: Results for strings already cleaned in this structure, so
+                repeated strings are only scanned once
 
         Returns:
             Cleaned data structure
         """
-        if isinstance(data, dict):
-            return {
-                key: self._clean_dict_recursively(value) for key, value in data.items()
-            }
-        elif isinstance(data, list):
-            return [self._clean_dict_recursively(item) for item in data]
-        elif isinstance(data, str):
-            return self.clean_text(data)
-        else:
-            return data
+        if cleaned is None:
+            cleaned = {}
+
+        def clean_leaf(value: Any) -> Any:
+            if not isinstance(value, str):
+                return value
+            result = cleaned.get(value)
+            if result is None:
+                result = cleaned[value] = self.clean_text(value)
+            return result
+
+        if not isinstance(data, (dict, list)):
+            return clean_leaf(data)
+
+        # Copies of the containers seen so far, keyed by the original's id;
+        # the originals stay referenced by data, so ids are not reused
+        copies: Dict[int, Union[Dict, list]] = {}
+
+        def copy_of(container: Union[Dict, list]) -> Union[Dict, list]:
+            copy = copies.get(id(container))
+            if copy is None:
+                copy = (
+                    dict(container) if isinstance(container, dict) else list(container)
+                )
+                copies[id(container)] = copy
+                pending.append(copy)
+            return copy
+
+        # Copies whose values still refer to the original children
+        pending: list = []
+        root = copy_of(data)
+        while pending:
+            node = pending.pop()
+            # Replacing values in place never resizes the container
+            for key, value in (
+                node.items() if isinstance(node, dict) else enumerate(node)
+            ):
+                if isinstance(value, (dict, list)):
+                    node[key] = copy_of(value)
+                else:
+                    node[key] = clean_leaf(value)
+        return root
 
     def enforce_constraints(self, plan: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -5,25 +5,39 @@ Converts a curriculum JSON (from curriculum_planner.plan_curriculum) into a .ppt
 with title slide, content slides with images, and assessment slide.
 """
 
+import functools
+import re
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Any, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
 from PIL import Image
 from pptx import Presentation
 from pptx.util import Inches, Pt
 from pptx.dml.color import RGBColor
 
+# Everything but letters, digits and whitespace; \w matches exactly what
+# str.isalnum() accepts plus "_", so the underscore is listed separately
+_KEYWORD_JUNK = re.compile(r"[^\w\s]|_")
+
+
+@functools.lru_cache(maxsize=None)
+def _http_session() -> requests.Session:
+    """Return the shared session used for image downloads."""
+    # Keep-alive connections to Unsplash are reused across slides, and the
+    # pool is large enough for every concurrent download in create_deck
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
+    return session
+
 
 def sanitize_keyword(text: str) -> str:
     """Sanitize text for use as an image search keyword."""
-    # Remove special characters and convert to lowercase
-    sanitized = "".join(c for c in text if c.isalnum() or c.isspace())
-    # Replace multiple spaces with single space and strip
-    sanitized = " ".join(sanitized.split())
-    # Convert to lowercase and replace spaces with +
-    return sanitized.lower().replace(" ", "+")
+    # Remove special characters, then join the lowercased words with +
+    return "+".join(_KEYWORD_JUNK.sub("", text).lower().split())
 
 
 def download_image(keyword: str, max_width: int = 800) -> Optional[Path]:
@@ -37,6 +51,7 @@ def download_image(keyword: str, max_width: int = 800) -> Optional[Path]:
     Returns:
         Path to the downloaded and resized image, or None if failed
     """
+    image_path: Optional[Path] = None
     try:
         # Construct Unsplash URL with multiple fallbacks
         sanitized_keyword = sanitize_keyword(keyword)
@@ -49,7 +64,7 @@ def download_image(keyword: str, max_width: int = 800) -> Optional[Path]:
         response = None
         for url in urls:
             try:
-                response = requests.get(
+                response = _http_session().get(
                     url,
                     timeout=10,
                     stream=True,
@@ -60,41 +75,53 @@ def download_image(keyword: str, max_width: int = 800) -> Optional[Path]:
                 response.raise_for_status()
                 break
             except requests.exceptions.RequestException:
+                # Release the pooled connection held by the unread stream
+                if response is not None:
+                    response.close()
+                response = None
                 continue
 
         if response is None:
             return None
 
-        # Create temporary file
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".jpg")
-
-        # Write image data
-        for chunk in response.iter_content(chunk_size=8192):
-            temp_file.write(chunk)
-        temp_file.close()
-
-        # Resize image while maintaining aspect ratio
-        with Image.open(temp_file.name) as img:
-            if img.width > max_width:
-                # Calculate new height maintaining aspect ratio
-                ratio = max_width / img.width
-                new_height = int(img.height * ratio)
-                img_resized = img.resize(
-                    (max_width, new_height), Image.Resampling.LANCZOS
-                )
-
-                # Save resized image
-                resized_path = Path(temp_file.name).with_suffix(".resized.jpg")
-                img_resized.save(resized_path, "JPEG", quality=85)
-
-                # Remove original temp file
-                Path(temp_file.name).unlink()
-
-                return resized_path
-            else:
-                return Path(temp_file.name)
+        with response:
+            with tempfile.NamedTemporaryFile(delete=False, suffix=".jpg") as temp_file:
+                image_path = Path(temp_file.name)
+
+                # Stream the body straight to disk instead of joining it in memory
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    temp_file.write(chunk)
+                temp_file.seek(0)
+
+                # Resize image while maintaining aspect ratio. Image.open only
+                # reads the header, so in-spec images are left on disk untouched
+                with Image.open(temp_file) as img:
+                    if img.width <= max_width:
+                        return image_path
+
+                    # Calculate new height maintaining aspect ratio
+                    ratio = max_width / img.width
+                    new_height = int(img.height * ratio)
+
+                    # Let the JPEG decoder downscale in the DCT domain first, so
+                    # LANCZOS only filters a near-final-size image
+                    img.draft(img.mode, (max_width, new_height))
+                    img_resized = img.resize(
+                        (max_width, new_height),
+                        Image.Resampling.LANCZOS,
+                        reducing_gap=3.0,
+                    )
+
+                # Save resized image over the original download
+                temp_file.seek(0)
+                temp_file.truncate()
+                img_resized.save(temp_file, "JPEG", quality=85)
+                return image_path
 
     except Exception as e:
+        # Don't leave a partial or unreadable download behind
+        if image_path is not None:
+            image_path.unlink(missing_ok=True)
         print(f"Warning: Failed to download image for '{keyword}': {e}")
         return None
 
@@ -215,15 +242,17 @@ def create_deck(plan: Dict[str, Any], output_path: Path) -> None:
     # Create title slide
     create_title_slide(prs, lesson_title, learning_objectives)
 
+    # Download every section image concurrently; the fetches are network bound
+    titles = [item.get("title", "Content Section") for item in content_outline]
+    if titles:
+        with ThreadPoolExecutor(max_workers=min(8, len(titles))) as executor:
+            image_paths = list(executor.map(download_image, titles))
+    else:
+        image_paths = []
+
     # Create content slides
-    for content_item in content_outline:
-        title = content_item.get("title", "Content Section")
+    for content_item, title, image_path in zip(content_outline, titles, image_paths):
         description = content_item.get("description", "")
-
-        # Download image based on title
-        image_path = download_image(title)
-
-        # Create slide
         create_content_slide(prs, title, description, image_path)
 
     # Create assessment slide
@@ -5,39 +5,121 @@ Generates detailed speaker notes with hooks, explanations, and closing questions
 for each slide in a curriculum presentation.
 """
 
-import os
-from typing import Dict, Any
-from openai import OpenAI
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
-
-# Load OpenAI API key
-client = (
-    OpenAI(api_key=os.getenv("OPENAI_API_KEY")) if os.getenv("OPENAI_API_KEY") else None
-)
+import functools
+import re
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, List
+import orjson
+
+# Share one OpenAI client with the planner: notes are generated right after
+# the plan, so they reuse the pooled keep-alive connections that call (and the
+# CLI warm-up) already opened instead of paying new TLS handshakes. It is
+# looked up per call rather than bound at import
+try:
+    from .defaults import NOTES_MODEL
+    from .openai_client import get_client
+except ImportError:
+    from defaults import NOTES_MODEL
+    from openai_client import get_client
+
+# Upper bound on note requests in flight at once, to stay within rate limits
+MAX_CONCURRENT_NOTES = 8
+
+# Characters dropped from lesson titles when deriving a notes filename; \w
+# matches exactly what str.isalnum() accepts, plus the underscore
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^\w\- ]+")
+_SPACE_RUNS = re.compile(r" +")
+
+# Sent first and byte-for-byte identical in every notes request, so that
+# provider-side prompt caching can reuse it. Anything that varies per slide
+# belongs in the user message after it
+SYSTEM_PROMPT = "You are an expert educator creating engaging speaker notes. Keep notes concise, practical, and under 150 words."
+
+DEFAULT_MODEL = NOTES_MODEL
+
+
+@functools.lru_cache(maxsize=256)
+def _complete(
+    prompt: str, model: str, max_tokens: int = 300, json_reply: bool = False
+) -> str:
+    """Return the model's reply to a notes prompt, reusing replies within a process."""
+    extra = {"response_format": {"type": "json_object"}} if json_reply else {}
+    response = get_client().chat.completions.create(
+        model=model,
+        messages=[
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": prompt},
+        ],
+        max_tokens=max_tokens,
+        temperature=0.7,
+        **extra,
+    )
+    return response.choices[0].message.content.strip()
 
 
-def generate_notes(plan: Dict[str, Any], model: str = "gpt-4o") -> Dict[int, str]:
+def generate_notes(
+    plan: Dict[str, Any], model: str = DEFAULT_MODEL, use_batch_api: bool = False
+) -> Dict[int, str]:
     """
     Generate speaker notes for all slides based on a curriculum plan.
 
     Args:
         plan: Curriculum plan dictionary from curriculum_planner
         model: OpenAI model to use for generation
+        use_batch_api: Submit the slides as one OpenAI Batch API job; see
+            generate_notes_via_batch for the latency tradeoff
 
     Returns:
         Dictionary mapping slide index (0-based) to speaker notes markdown
     """
-    notes = {}
+    if use_batch_api and get_client():
+        return generate_notes_via_batch(plan, model)
+
+    # Every slide is an independent API round-trip, so they are requested
+    # concurrently; each generator falls back on its own errors
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_NOTES) as executor:
+        futures = _submit_slide_notes(executor, plan, model)
+        return {index: future.result() for index, future in futures.items()}
+
+
+def generate_notes_many(
+    plans: List[Dict[str, Any]], model: str = DEFAULT_MODEL
+) -> List[Dict[int, str]]:
+    """
+    Generate speaker notes for several curriculum plans at once.
+
+    Slides from all plans share one pool of MAX_CONCURRENT_NOTES requests, so
+    a short plan never leaves the pool idle while a long one finishes.
+
+    Args:
+        plans: Curriculum plan dictionaries from curriculum_planner
+        model: OpenAI model to use for generation
+
+    Returns:
+        One notes dictionary per plan, in the same order, as from generate_notes
+    """
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_NOTES) as executor:
+        all_futures = [_submit_slide_notes(executor, plan, model) for plan in plans]
+        return [
+            {index: future.result() for index, future in futures.items()}
+            for futures in all_futures
+        ]
+
+
+def _submit_slide_notes(
+    executor: ThreadPoolExecutor, plan: Dict[str, Any], model: str
+) -> Dict[int, Future]:
+    """Queue one notes request per slide of a plan, keyed by slide index."""
+    assessment_slide_index = len(plan["content_outline"]) + 1
 
     # Generate notes for title slide (slide 0)
-    notes[0] = generate_title_slide_notes(plan, model)
+    futures = {0: executor.submit(generate_title_slide_notes, plan, model)}
 
     # Generate notes for each content slide (slides 1 to n)
     for i, section in enumerate(plan["content_outline"], 1):
-        notes[i] = generate_content_slide_notes(
+        futures[i] = executor.submit(
+            generate_content_slide_notes,
             slide_index=i,
             title=section["title"],
             description=section["description"],
@@ -46,18 +128,165 @@ def generate_notes(plan: Dict[str, Any], model: str = "gpt-4o") -> Dict[int, str
         )
 
     # Generate notes for assessment slide (final slide)
+    futures[assessment_slide_index] = executor.submit(
+        generate_assessment_slide_notes, plan, model
+    )
+    return futures
+
+
+def generate_notes_batched(
+    plan: Dict[str, Any], model: str = DEFAULT_MODEL
+) -> Dict[int, str]:
+    """
+    Generate speaker notes for all slides with a single API call.
+
+    The model is asked for a JSON object keyed by slide index, which saves
+    the per-slide round-trips and repeated instructions of generate_notes.
+    Falls back to generate_notes if the reply is missing any slide.
+
+    Args:
+        plan: Curriculum plan dictionary from curriculum_planner
+        model: OpenAI model to use for generation
+
+    Returns:
+        Dictionary mapping slide index (0-based) to speaker notes markdown
+    """
+    if not get_client():
+        return generate_notes(plan, model)
+
     assessment_slide_index = len(plan["content_outline"]) + 1
-    notes[assessment_slide_index] = generate_assessment_slide_notes(plan, model)
+    slides = [
+        f"Slide 0 (title): {plan['lesson_title']}\n"
+        f"Learning Objectives: {'; '.join(plan['learning_objectives'])}"
+    ]
+    slides.extend(
+        f"Slide {i}: {section['title']} - {section['description']}"
+        for i, section in enumerate(plan["content_outline"], 1)
+    )
+    slides.append(
+        f"Slide {assessment_slide_index} (assessment): "
+        f"{'; '.join(plan['suggested_assessments'])}"
+    )
+
+    prompt = f"""Draft concise speaker notes ≤150 words for each slide of a lesson titled "{plan['lesson_title']}".
+
+{chr(10).join(slides)}
+
+For every slide include an engaging hook or analogy, the key explanation and a closing question.
+
+Return a JSON object keyed by slide index with markdown speaker-notes values."""
+
+    try:
+        reply = orjson.loads(
+            _complete(
+                prompt,
+                model,
+                max_tokens=300 * (assessment_slide_index + 1),
+                json_reply=True,
+            )
+        )
+        notes = {
+            index: reply[str(index)].strip()
+            for index in range(assessment_slide_index + 1)
+        }
+
+    except Exception as e:
+        print(f"Warning: Failed to generate batched speaker notes: {e}")
+        return generate_notes(plan, model)
 
     return notes
 
 
-def generate_title_slide_notes(plan: Dict[str, Any], model: str = "gpt-4o") -> str:
-    """Generate speaker notes for the title slide."""
+def generate_notes_via_batch(
+    plan: Dict[str, Any], model: str = DEFAULT_MODEL, poll_interval: float = 30.0
+) -> Dict[int, str]:
+    """
+    Generate speaker notes for all slides through the OpenAI Batch API.
+
+    Batch jobs cost half as much as regular calls and do not count against
+    rate limits, but OpenAI may take up to 24 hours to finish one, so this
+    only suits non-interactive runs. Falls back to the regular per-slide
+    calls if the job cannot be submitted, fails or leaves a slide unanswered.
+
+    Args:
+        plan: Curriculum plan dictionary from curriculum_planner
+        model: OpenAI model to use for generation
+        poll_interval: Seconds to wait between job status checks
+
+    Returns:
+        Dictionary mapping slide index (0-based) to speaker notes markdown
+    """
+    client = get_client()
     if not client:
-        return _fallback_title_notes(plan)
+        return generate_notes(plan, model)
+
+    assessment_slide_index = len(plan["content_outline"]) + 1
+    prompts = {0: _title_prompt(plan)}
+    for i, section in enumerate(plan["content_outline"], 1):
+        prompts[i] = _content_prompt(
+            i, section["title"], section["description"], plan["lesson_title"]
+        )
+    prompts[assessment_slide_index] = _assessment_prompt(plan)
+
+    requests_jsonl = b"\n".join(
+        orjson.dumps(
+            {
+                "custom_id": f"slide_{index}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": model,
+                    "messages": [
+                        {"role": "system", "content": SYSTEM_PROMPT},
+                        {"role": "user", "content": prompt},
+                    ],
+                    "max_tokens": 300,
+                    "temperature": 0.7,
+                },
+            }
+        )
+        for index, prompt in prompts.items()
+    )
+
+    try:
+        batch_file = client.files.create(
+            file=("speaker_notes.jsonl", requests_jsonl), purpose="batch"
+        )
+        batch = client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            time.sleep(poll_interval)
+            batch = client.batches.retrieve(batch.id)
+
+        if not batch.output_file_id:
+            raise RuntimeError(f"batch {batch.id} ended as {batch.status}")
+
+        notes = {}
+        output = client.files.content(batch.output_file_id).text
+        for line in output.splitlines():
+            result = orjson.loads(line)
+            body = (result.get("response") or {}).get("body") or {}
+            if body.get("choices"):
+                index = int(result["custom_id"].removeprefix("slide_"))
+                notes[index] = body["choices"][0]["message"]["content"].strip()
+
+        if notes.keys() != prompts.keys():
+            raise RuntimeError(f"batch {batch.id} left slides unanswered")
+        notes = {index: notes[index] for index in prompts}
+
+    except Exception as e:
+        print(f"Warning: Failed to generate speaker notes via batch: {e}")
+        return generate_notes(plan, model)
+
+    return notes
+
 
-    prompt = f"""For the title slide of a lesson titled "{plan['lesson_title']}", draft concise speaker notes ≤150 words.
+def _title_prompt(plan: Dict[str, Any]) -> str:
+    """Build the notes prompt for the title slide."""
+    return f"""For the title slide of a lesson titled "{plan['lesson_title']}", draft concise speaker notes ≤150 words.
 
 Learning Objectives:
 {chr(10).join(f'• {obj}' for obj in plan['learning_objectives'])}
@@ -69,81 +298,35 @@ Include:
 
 Format as markdown."""
 
-    try:
-        response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are an expert educator creating engaging speaker notes. Keep notes concise, practical, and under 150 words.",
-                },
-                {"role": "user", "content": prompt},
-            ],
-            max_tokens=300,
-            temperature=0.7,
-        )
-
-        return response.choices[0].message.content.strip()
-
-    except Exception as e:
-        print(f"Warning: Failed to generate title slide notes: {e}")
-        return _fallback_title_notes(plan)
 
-
-def generate_content_slide_notes(
-    slide_index: int,
-    title: str,
-    description: str,
-    lesson_context: str,
-    model: str = "gpt-4o",
+def _content_prompt(
+    slide_index: int, title: str, description: str, lesson_context: str
 ) -> str:
-    """Generate speaker notes for a content slide."""
-    if not client:
-        return _fallback_content_notes(title, description)
-
-    prompt = f"""For slide {slide_index} titled "{title}", draft concise speaker notes ≤150 words.
-
-Slide Content: {description}
-Lesson Context: {lesson_context}
+    """Build the notes prompt for a content slide."""
+    # Instructions, then the lesson, then the slide: every content slide of a
+    # lesson shares the longest possible prefix after SYSTEM_PROMPT
+    return f"""Draft concise speaker notes ≤150 words for one slide of a lesson.
 
 Include:
 - Engaging hook or analogy relevant to the topic
 - Key explanation of the content
 - Closing question to check understanding or transition
 
-Format as markdown."""
+Format as markdown.
 
-    try:
-        response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are an expert educator creating engaging speaker notes. Keep notes concise, practical, and under 150 words.",
-                },
-                {"role": "user", "content": prompt},
-            ],
-            max_tokens=300,
-            temperature=0.7,
-        )
-
-        return response.choices[0].message.content.strip()
-
-    except Exception as e:
-        print(f"Warning: Failed to generate notes for slide {slide_index}: {e}")
-        return _fallback_content_notes(title, description)
+Lesson Context: {lesson_context}
 
+Slide {slide_index}: "{title}"
+Slide Content: {description}"""
 
-def generate_assessment_slide_notes(plan: Dict[str, Any], model: str = "gpt-4o") -> str:
-    """Generate speaker notes for the assessment slide."""
-    if not client:
-        return _fallback_assessment_notes(plan)
 
+def _assessment_prompt(plan: Dict[str, Any]) -> str:
+    """Build the notes prompt for the assessment slide."""
     assessments_text = "\n".join(
         f"• {assessment}" for assessment in plan["suggested_assessments"]
     )
 
-    prompt = f"""For the final assessment slide of "{plan['lesson_title']}", draft concise speaker notes ≤150 words.
+    return f"""For the final assessment slide of "{plan['lesson_title']}", draft concise speaker notes ≤150 words.
 
 Suggested Assessments:
 {assessments_text}
@@ -155,21 +338,49 @@ Include:
 
 Format as markdown."""
 
+
+def generate_title_slide_notes(plan: Dict[str, Any], model: str = DEFAULT_MODEL) -> str:
+    """Generate speaker notes for the title slide."""
+    if not get_client():
+        return _fallback_title_notes(plan)
+
     try:
-        response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are an expert educator creating engaging speaker notes. Keep notes concise, practical, and under 150 words.",
-                },
-                {"role": "user", "content": prompt},
-            ],
-            max_tokens=300,
-            temperature=0.7,
-        )
+        return _complete(_title_prompt(plan), model)
+
+    except Exception as e:
+        print(f"Warning: Failed to generate title slide notes: {e}")
+        return _fallback_title_notes(plan)
+
+
+def generate_content_slide_notes(
+    slide_index: int,
+    title: str,
+    description: str,
+    lesson_context: str,
+    model: str = DEFAULT_MODEL,
+) -> str:
+    """Generate speaker notes for a content slide."""
+    if not get_client():
+        return _fallback_content_notes(title, description)
 
-        return response.choices[0].message.content.strip()
+    try:
+        prompt = _content_prompt(slide_index, title, description, lesson_context)
+        return _complete(prompt, model)
+
+    except Exception as e:
+        print(f"Warning: Failed to generate notes for slide {slide_index}: {e}")
+        return _fallback_content_notes(title, description)
+
+
+def generate_assessment_slide_notes(
+    plan: Dict[str, Any], model: str = DEFAULT_MODEL
+) -> str:
+    """Generate speaker notes for the assessment slide."""
+    if not get_client():
+        return _fallback_assessment_notes(plan)
+
+    try:
+        return _complete(_assessment_prompt(plan), model)
 
     except Exception as e:
         print(f"Warning: Failed to generate assessment slide notes: {e}")
@@ -196,37 +407,37 @@ def save_notes_to_markdown(
     """
     # Generate filename from lesson title
     if output_path is None:
-        safe_title = "".join(
-            c for c in lesson_title if c.isalnum() or c in " -_"
-        ).strip()
-        safe_title = "_".join(safe_title.split())
+        safe_title = _UNSAFE_FILENAME_CHARS.sub("", lesson_title).strip()
+        safe_title = _SPACE_RUNS.sub("_", safe_title)
         output_path = f"{safe_title}_notes.md"
 
-    # Build markdown content
-    markdown_content = f"# Speaker Notes: {lesson_title}\n\n"
-
-    for slide_index in sorted(notes.keys()):
-        if slide_index == 0:
-            slide_title = "Title Slide"
-        elif slide_index == max(notes.keys()):
-            slide_title = "Assessment Slide"
-        else:
-            slide_title = f"Content Slide {slide_index}"
-
-        markdown_content += f"## Slide {slide_index}: {slide_title}\n\n"
-        markdown_content += notes[slide_index] + "\n\n"
-
-    # Add OER resources section if provided
-    if oer_resources:
-        markdown_content += "## Additional Resources\n\n"
-        markdown_content += "The following Open Educational Resources (OER) from OER Commons provide additional materials for this lesson:\n\n"
-        for i, url in enumerate(oer_resources, 1):
-            markdown_content += f"{i}. [{url}]({url})\n"
-        markdown_content += "\n"
-
-    # Write to file
+    # Write each section straight to the file instead of growing one string
+    last_slide_index = max(notes, default=0)
     with open(output_path, "w", encoding="utf-8") as f:
-        f.write(markdown_content)
+        f.write(f"# Speaker Notes: {lesson_title}\n\n")
+
+        for slide_index in sorted(notes):
+            if slide_index == 0:
+                slide_title = "Title Slide"
+            elif slide_index == last_slide_index:
+                slide_title = "Assessment Slide"
+            else:
+                slide_title = f"Content Slide {slide_index}"
+
+            f.write(
+                f"## Slide {slide_index}: {slide_title}\n\n{notes[slide_index]}\n\n"
+            )
+
+        # Add OER resources section if provided
+        if oer_resources:
+            f.write("## Additional Resources\n\n")
+            f.write(
+                "The following Open Educational Resources (OER) from OER Commons provide additional materials for this lesson:\n\n"
+            )
+            f.writelines(
+                f"{i}. [{url}]({url})\n" for i, url in enumerate(oer_resources, 1)
+            )
+            f.write("\n")
 
     return output_path
 
@@ -0,0 +1,32 @@
+"""
+Topic normalization shared by the lesson planners' reworded-request caches.
+
+Provides:
+- topic_tokens: Reduce free text to a set of comparable word stems
+
+Two requests are treated as rewordings of each other only when their
+normalized tokens are identical; any overlap short of that is a different
+lesson.
+"""
+
+import re
+from typing import FrozenSet
+
+# Filler words ignored when comparing reworded lesson requests
+_STOPWORDS = frozenset(
+    {"a", "an", "and", "for", "in", "of", "on", "the", "to", "with", "lesson"}
+)
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def topic_tokens(text: str) -> FrozenSet[str]:
+    """Normalize free text into a set of comparable word stems."""
+    tokens = set()
+    for word in _WORD_RE.findall(text.lower()):
+        if word in _STOPWORDS:
+            continue
+        # Crude plural folding so "ecosystems" matches "ecosystem"
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        tokens.add(word)
+    return frozenset(tokens)
@@ -6,18 +6,19 @@ This script demonstrates the curriculum agent functionality with the
 exact inputs specified in the requirements.
 """
 
-import json
 import sys
 import os
 
 # Add the parent directory to the path so we can import our modules
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from curriculum_agent import CurriculumAgent, LessonPlanInput, Constraint  # noqa: E402
-
 
 def main():
     """Test the curriculum agent with the specified inputs."""
+    # Imported here so merely importing this script (e.g. during pytest
+    # collection) does not load the agent and its pydantic models
+    from curriculum_agent import CurriculumAgent, LessonPlanInput, Constraint
+
     print("🎯 Testing Curriculum Ideation & Constraint Enforcement Module")
     print("=" * 60)
 
@@ -92,11 +93,9 @@ def main():
         print("📋 Generated Lesson Plan (JSON Format):")
         print("=" * 60)
 
-        # Convert to dict for JSON serialization
-        lesson_dict = lesson_plan.model_dump()
-
-        # Pretty print JSON
-        print(json.dumps(lesson_dict, indent=2, ensure_ascii=False))
+        # Pretty print JSON straight from the model, without an
+        # intermediate dict
+        print(lesson_plan.model_dump_json(indent=2))
 
         print("=" * 60)
         print(
@@ -6,12 +6,21 @@ import unittest
 import responses
 import requests
 from unittest.mock import patch
-from educator_agent.oer_resource_finder import suggest_oer, _make_oer_request
+from educator_agent.oer_resource_finder import (
+    suggest_oer,
+    suggest_oer_batch,
+    _make_oer_request,
+    _search_oer,
+)
 
 
 class TestOERResourceFinder(unittest.TestCase):
     """Test cases for OER Commons API integration."""
 
+    def setUp(self):
+        """Start every test without search results cached by earlier tests."""
+        _search_oer.cache_clear()
+
     @responses.activate
     def test_suggest_oer_success(self):
         """Test successful OER Commons API response."""
@@ -182,6 +191,44 @@ class TestOERResourceFinder(unittest.TestCase):
         # Should only return the valid URL
         self.assertEqual(urls, ["https://www.oercommons.org/valid-course"])
 
+    @patch("educator_agent.oer_resource_finder._make_oer_request")
+    def test_suggest_oer_unreachable_api_uses_fallback(self, mock_request):
+        """Test a request that fails after retries falls back to search URLs."""
+        mock_request.side_effect = requests.ConnectionError("offline")
+
+        urls = suggest_oer("plant cells", count=2)
+
+        self.assertEqual(
+            urls,
+            [
+                "https://oercommons.org/search?q=plant%20cells",
+                "https://oercommons.org/search?q=plant%20cells"
+                "&f.material_type=lesson-plan",
+            ],
+        )
+        mock_request.assert_called_once_with(
+            "https://oercommons.org/api/v1/search",
+            {"search": "plant cells", "per_page": 2, "only": "resource"},
+        )
+
+    @responses.activate
+    def test_repeated_topic_served_from_cache(self):
+        """Test an identical topic and count is only searched once."""
+        responses.add(
+            responses.GET,
+            "https://oercommons.org/api/v1/search",
+            json={"results": [{"url": "/courses/cells", "title": "Cells"}]},
+            status=200,
+        )
+
+        first = suggest_oer("cells", count=1)
+        first.append("https://example.org/mutated")
+        second = suggest_oer("cells", count=1)
+        suggest_oer("cells", count=2)
+
+        self.assertEqual(second, ["https://www.oercommons.org/courses/cells"])
+        self.assertEqual(len(responses.calls), 2)
+
     def test_url_conversion(self):
         """Test URL conversion logic with various URL formats."""
         with responses.RequestsMock() as rsps:
@@ -202,6 +249,7 @@ class TestOERResourceFinder(unittest.TestCase):
 
             for input_url, expected_url in test_cases:
                 rsps.reset()
+                _search_oer.cache_clear()
                 mock_response = {
                     "results": [{"url": input_url, "title": "Test Course"}]
                 }
@@ -218,6 +266,30 @@ class TestOERResourceFinder(unittest.TestCase):
                     urls, [expected_url], f"Failed for input URL: {input_url}"
                 )
 
+    @responses.activate
+    def test_suggest_oer_batch_searches_each_topic_once(self):
+        """Test a batch lookup returns results per topic and skips duplicates."""
+        for topic in ("plants", "animals"):
+            responses.add(
+                responses.GET,
+                "https://oercommons.org/api/v1/search",
+                json={"results": [{"url": f"/courses/{topic}", "title": topic}]},
+                status=200,
+                match=[
+                    responses.matchers.query_param_matcher(
+                        {"search": topic, "per_page": "2", "only": "resource"}
+                    )
+                ],
+            )
+
+        urls = suggest_oer_batch(["plants", "animals", "plants"], count=2)
+
+        self.assertEqual(list(urls), ["plants", "animals"])
+        self.assertEqual(
+            urls["animals"], ["https://www.oercommons.org/courses/animals"]
+        )
+        self.assertEqual(len(responses.calls), 2)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,79 @@
+"""
+Shared pytest setup for the test suite.
+
+Puts the ``code`` directory on ``sys.path`` once per session so the test
+modules can import ``educator_agent`` and ``curriculum_agent`` directly, and
+provides fixtures reused across test modules.
+"""
+
+import json
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "code"))
+
+MOCKED_PLAN = {
+    "lesson_title": "Environmental Science: Ecosystem Basics",
+    "learning_objectives": [
+        "Students will define ecosystems and their components",
+        "Students will identify relationships between organisms",
+        "Students will analyze human impact on ecosystems",
+    ],
+    "content_outline": [
+        {
+            "title": "Introduction to Ecosystems",
+            "description": "Define ecosystems and provide examples from local environment",
+        },
+        {
+            "title": "Ecosystem Components",
+            "description": "Explore biotic and abiotic factors through interactive activities",
+        },
+        {
+            "title": "Interactions and Relationships",
+            "description": "Examine predator-prey relationships and food webs",
+        },
+    ],
+    "suggested_assessments": [
+        "Ecosystem mapping activity",
+        "Biotic vs abiotic sorting exercise",
+        "Food web construction project",
+        "Exit ticket with vocabulary terms",
+    ],
+}
+
+
+@dataclass
+class _Message:
+    content: str
+
+
+@dataclass
+class _Choice:
+    message: _Message
+
+
+@dataclass
+class _ChatCompletion:
+    """Just the part of an OpenAI chat completion the code under test reads."""
+
+    choices: List[_Choice]
+
+
+def _chat_completion(text: str) -> _ChatCompletion:
+    return _ChatCompletion(choices=[_Choice(_Message(text))])
+
+
+@pytest.fixture
+def fake_response():
+    """Factory for a chat completion whose first choice replies with text."""
+    return _chat_completion
+
+
+@pytest.fixture(scope="module")
+def mocked_openai_response():
+    """Chat completion whose reply is MOCKED_PLAN; treat it as read-only."""
+    return _chat_completion(json.dumps(MOCKED_PLAN))
@@ -0,0 +1,276 @@
+"""
+Tests for the Typer CLI wizard.
+
+Covers argument parsing helpers, the on-disk plan cache and the --json-only
+fast path without making any API calls.
+"""
+
+import io
+import json
+import subprocess
+from unittest.mock import Mock, patch
+import sys
+import os
+
+from typer.testing import CliRunner
+
+from educator_agent import cli, curriculum_planner
+
+SAMPLE_PLAN = {
+    "lesson_title": "Ecosystems",
+    "learning_objectives": ["Define an ecosystem"],
+    "content_outline": [{"title": "Intro", "description": "Overview"}],
+    "suggested_assessments": ["Exit ticket"],
+}
+
+PARAMS = {"grade_level": "5th Grade", "subject": "Science", "model": "gpt-4o"}
+
+
+class TestCli:
+    """Test suite for the CLI wizard."""
+
+    def test_parse_constraints(self):
+        """Test constraints are split, stripped and empty entries dropped."""
+        assert cli.parse_constraints("age-appropriate,privacy-protecting") == (
+            "age-appropriate",
+            "privacy-protecting",
+        )
+        assert cli.parse_constraints(" a , ,b,") == ("a", "b")
+        assert cli.parse_constraints("") == ()
+
+    def test_json_only_prints_plan(self):
+        """Test --json-only writes the plan as indented JSON."""
+        with patch.object(cli, "cached_plan_curriculum", return_value=SAMPLE_PLAN):
+            result = CliRunner().invoke(
+                cli.app, ["--grade", "5th Grade", "--subject", "Science", "--json-only"]
+            )
+
+        assert result.exit_code == 0
+        assert json.loads(result.output) == SAMPLE_PLAN
+
+    def test_json_only_writes_to_text_only_stdout(self, monkeypatch):
+        """Test --json-only output works when stdout has no binary buffer."""
+        stdout = io.StringIO()
+        monkeypatch.setattr(sys, "stdout", stdout)
+        with patch.object(cli, "cached_plan_curriculum", return_value=SAMPLE_PLAN):
+            cli._generate_outputs(
+                dict(PARAMS),
+                {},
+                json_only=True,
+                quiet=True,
+                use_cache=False,
+                refresh_cache=False,
+            )
+
+        assert json.loads(stdout.getvalue()) == SAMPLE_PLAN
+
+    def test_unknown_model_rejected_before_planning(self):
+        """Test an unsupported --model fails argument parsing without a plan call."""
+        with patch.object(cli, "cached_plan_curriculum") as mock:
+            result = CliRunner().invoke(
+                cli.app,
+                ["--grade", "5th Grade", "--subject", "Science", "--model", "x"],
+            )
+
+        assert result.exit_code == 2
+        mock.assert_not_called()
+
+    def test_default_models_accepted(self):
+        """Test the planner and speaker notes defaults are both valid --model values."""
+        from educator_agent import speaker_notes
+
+        assert curriculum_planner.DEFAULT_MODEL in cli.SUPPORTED_MODELS
+        assert speaker_notes.DEFAULT_MODEL in cli.SUPPORTED_MODELS
+
+        with patch.object(cli, "cached_plan_curriculum", return_value=SAMPLE_PLAN):
+            result = CliRunner().invoke(
+                cli.app,
+                ["--grade", "5th Grade", "--subject", "Science", "--json-only"]
+                + ["--model", "gpt-4o-mini"],
+            )
+
+        assert result.exit_code == 0
+
+    def test_prewarm_opens_connection_and_ignores_errors(self, monkeypatch):
+        """Test the planner warm-up hits the API once and never raises."""
+        client = Mock()
+        client.models.retrieve.side_effect = RuntimeError("offline")
+        monkeypatch.setattr(curriculum_planner, "client", client)
+
+        cli._prewarm_planner("gpt-4o")
+        client.models.retrieve.assert_called_once_with("gpt-4o")
+
+    def test_cached_plan_reused_across_runs(self, tmp_path, monkeypatch):
+        """Test an identical request is served from the on-disk cache."""
+        monkeypatch.setattr(cli, "CACHE_DIR", tmp_path)
+        monkeypatch.setattr(curriculum_planner, "client", object())
+
+        with patch.object(
+            curriculum_planner, "plan_curriculum", return_value=SAMPLE_PLAN
+        ) as mock:
+            first = cli.cached_plan_curriculum(dict(PARAMS))
+            second = cli.cached_plan_curriculum(dict(PARAMS))
+            cli.cached_plan_curriculum(dict(PARAMS), refresh=True)
+            cli.cached_plan_curriculum(dict(PARAMS), use_cache=False)
+
+        assert first == second == SAMPLE_PLAN
+        assert mock.call_count == 3
+        assert len(list(tmp_path.glob("plans/*.json"))) == 1
+
+    def test_cached_notes_keep_integer_slide_indices(self, tmp_path, monkeypatch):
+        """Test cached speaker notes round-trip with int slide keys."""
+        from educator_agent import speaker_notes
+
+        monkeypatch.setattr(cli, "CACHE_DIR", tmp_path)
+        monkeypatch.setattr(speaker_notes, "get_client", lambda: object())
+
+        with patch.object(
+            speaker_notes, "generate_notes", return_value={0: "Hi", 1: "More"}
+        ) as mock:
+            cli.cached_generate_notes(SAMPLE_PLAN, "gpt-4o")
+            notes = cli.cached_generate_notes(SAMPLE_PLAN, "gpt-4o")
+            cli.cached_generate_notes(SAMPLE_PLAN, "gpt-4")
+
+        assert notes == {0: "Hi", 1: "More"}
+        assert mock.call_count == 2
+
+    def test_demo_plans_are_not_cached(self, tmp_path, monkeypatch):
+        """Test plans generated without an API client are not written to disk."""
+        monkeypatch.setattr(cli, "CACHE_DIR", tmp_path)
+        monkeypatch.setattr(curriculum_planner, "client", None)
+
+        with patch.object(
+            curriculum_planner, "plan_curriculum", return_value=SAMPLE_PLAN
+        ):
+            cli.cached_plan_curriculum(dict(PARAMS))
+
+        assert list(tmp_path.iterdir()) == []
+
+    def test_post_plan_outputs_generated_together(self, tmp_path):
+        """Test --oer, --pptx and --notes all run and the notes link the OER."""
+        pptx_path = tmp_path / "deck.pptx"
+        notes_path = tmp_path / "notes.md"
+        with patch.object(
+            cli, "cached_plan_curriculum", return_value=SAMPLE_PLAN
+        ), patch("educator_agent.slide_generator.create_deck") as create_deck, patch(
+            "educator_agent.speaker_notes.generate_notes", return_value={0: "Hi"}
+        ) as generate_notes, patch(
+            "educator_agent.oer_resource_finder.suggest_oer",
+            return_value=["https://oer/1"],
+        ), patch(
+            "educator_agent.speaker_notes.save_notes_to_markdown",
+            return_value=str(notes_path),
+        ) as save_notes:
+            result = CliRunner().invoke(
+                cli.app,
+                [
+                    "--grade",
+                    "5th Grade",
+                    "--subject",
+                    "Science",
+                    "--pptx",
+                    str(pptx_path),
+                    "--notes",
+                    "--oer",
+                    "2",
+                ],
+            )
+
+        assert result.exit_code == 0, result.output
+        create_deck.assert_called_once_with(SAMPLE_PLAN, pptx_path)
+        generate_notes.assert_called_once_with(SAMPLE_PLAN, model="gpt-4o-mini")
+        assert save_notes.call_args.args[0] == {0: "Hi"}
+        assert save_notes.call_args.kwargs["oer_resources"] == ["https://oer/1"]
+        assert "Deck saved" in result.output
+        assert "Speaker notes saved" in result.output
+
+    def test_notes_model_option_reaches_notes(self, tmp_path):
+        """Test --notes-model picks the notes model independently of --model."""
+        with patch.object(
+            cli, "cached_plan_curriculum", return_value=SAMPLE_PLAN
+        ), patch(
+            "educator_agent.speaker_notes.generate_notes", return_value={0: "Hi"}
+        ) as generate_notes, patch(
+            "educator_agent.speaker_notes.save_notes_to_markdown",
+            return_value=str(tmp_path / "notes.md"),
+        ):
+            result = CliRunner().invoke(
+                cli.app,
+                ["--grade", "5th Grade", "--subject", "Science", "--notes"]
+                + ["--model", "gpt-4", "--notes-model", "gpt-4o"],
+            )
+
+        assert result.exit_code == 0, result.output
+        generate_notes.assert_called_once_with(SAMPLE_PLAN, model="gpt-4o")
+
+    def test_copilot_without_credentials_fails_before_planning(self, monkeypatch):
+        """Test --copilot with missing Microsoft 365 credentials skips the plan."""
+        from educator_agent import copilot_pptx
+
+        monkeypatch.setattr(copilot_pptx, "_load_env", lambda: None)
+        for name in ("MS_CLIENT_ID", "MS_TENANT_ID", "MS_CLIENT_SECRET"):
+            monkeypatch.delenv(name, raising=False)
+
+        with patch.object(cli, "cached_plan_curriculum") as mock:
+            result = CliRunner().invoke(
+                cli.app,
+                ["--grade", "5th Grade", "--subject", "Science", "--copilot"],
+            )
+
+        assert result.exit_code == 1
+        assert "Missing Microsoft 365 credentials" in result.output
+        mock.assert_not_called()
+
+    def test_interactive_prompts_share_one_console(self):
+        """Test the interactive wizard reads every answer through rich prompts."""
+        # Six basic defaults, then: no deck, notes, OER x2, no ZIP, no Copilot
+        answers = "\n" * 6 + "n\ny\ny\n2\nn\nn\n" + "y\n"
+        with patch.object(cli, "_prewarm_planner"), patch.object(
+            cli, "_generate_outputs"
+        ) as generate:
+            result = CliRunner().invoke(cli.app, [], input=answers)
+
+        assert result.exit_code == 0, result.output
+        params, outputs = generate.call_args.args
+        assert params["grade_level"] == "5th Grade"
+        assert params["constraints"] == ("age-appropriate", "privacy-protecting")
+        assert outputs == {"notes": True, "oer": 2, "copilot": False}
+
+    def test_help_skips_heavy_imports(self):
+        """Test --help loads neither the planner nor the output dependencies."""
+        code = (
+            "import sys\n"
+            "from educator_agent import cli\n"
+            "try:\n"
+            "    cli.app(['--help'])\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            "heavy = ('openai', 'msal', 'requests', 'pptx', 'PIL',\n"
+            "         'educator_agent.packager')\n"
+            "print(','.join(m for m in heavy if m in sys.modules))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=os.path.join(os.path.dirname(__file__), "..", "code"),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        assert result.stdout.splitlines()[-1] == ""
+
+    def test_unwritable_output_reported(self):
+        """Test a file-system error while saving outputs exits with a clear message."""
+        with patch.object(
+            cli, "cached_plan_curriculum", return_value=SAMPLE_PLAN
+        ), patch(
+            "educator_agent.slide_generator.create_deck",
+            side_effect=PermissionError("deck.pptx"),
+        ):
+            result = CliRunner().invoke(
+                cli.app,
+                ["--grade", "5th Grade", "--subject", "Science", "--pptx", "deck.pptx"],
+            )
+
+        assert result.exit_code == 1
+        assert "Could not write output file" in result.output
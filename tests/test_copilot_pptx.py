@@ -0,0 +1,111 @@
+"""
+Tests for the Microsoft Copilot PowerPoint exporter.
+
+Graph API traffic is mocked with ``responses``; no credentials are needed.
+"""
+
+import json
+from unittest.mock import patch
+import pytest
+import responses
+
+from educator_agent.copilot_pptx import (
+    CopilotPowerPointError,
+    create_presentation_fallback,
+    create_presentation_via_copilot,
+    _graph_session,
+    _msal_app,
+    get_access_token,
+)
+
+GRAPH = "https://graph.microsoft.com/v1.0"
+
+SAMPLE_PLAN = {
+    "lesson_title": "Ecosystems",
+    "learning_objectives": ["Define an ecosystem"],
+    "content_outline": [{"title": "Intro", "description": "Overview"}],
+    "suggested_assessments": ["Exit ticket"],
+}
+
+
+class TestCopilotPptx:
+    """Test suite for the Copilot exporter."""
+
+    def test_missing_credentials_raise(self, monkeypatch):
+        """Test authentication fails fast without Microsoft 365 credentials."""
+        for name in ("MS_CLIENT_ID", "MS_TENANT_ID", "MS_CLIENT_SECRET"):
+            monkeypatch.delenv(name, raising=False)
+
+        with pytest.raises(CopilotPowerPointError, match="Missing Microsoft 365"):
+            get_access_token()
+
+    def test_token_served_from_cached_msal_app(self, monkeypatch):
+        """Test repeated exports reuse one MSAL app and its token cache."""
+        monkeypatch.setenv("MS_CLIENT_ID", "id")
+        monkeypatch.setenv("MS_TENANT_ID", "tenant")
+        monkeypatch.setenv("MS_CLIENT_SECRET", "secret")
+        _msal_app.cache_clear()
+
+        with patch("msal.ConfidentialClientApplication") as app_cls:
+            app_cls.return_value.acquire_token_for_client.return_value = {
+                "access_token": "token"
+            }
+            assert get_access_token() == "token"
+            assert get_access_token() == "token"
+        _msal_app.cache_clear()
+
+        app_cls.assert_called_once()
+
+    @responses.activate
+    def test_fallback_uploads_and_shares(self):
+        """Test the fallback path uploads the outline and returns a share link."""
+        responses.add(responses.GET, f"{GRAPH}/me/drive", json={"id": "d"})
+        responses.add(
+            responses.PUT,
+            f"{GRAPH}/me/drive/root:/Ecosystems_Presentation.pptx:/content",
+            json={"id": "f1", "webUrl": "https://files/f1"},
+            status=201,
+        )
+        responses.add(
+            responses.POST,
+            f"{GRAPH}/me/drive/items/f1/createLink",
+            json={"link": {"webUrl": "https://share/f1"}},
+        )
+
+        result = create_presentation_fallback(SAMPLE_PLAN, "token")
+
+        assert result["shareUrl"] == "https://share/f1"
+        assert all(
+            call.request.headers["Authorization"] == "Bearer token"
+            for call in responses.calls
+        )
+        assert responses.calls[1].request.headers["Content-Type"] == "text/plain"
+        assert "Authorization" not in _graph_session().headers
+        body = responses.calls[1].request.body.decode("utf-8")
+        assert "# Ecosystems" in body
+        assert "• Define an ecosystem" in body
+        assert json.loads(responses.calls[2].request.body) == {
+            "type": "view",
+            "scope": "organization",
+        }
+
+    @responses.activate
+    def test_copilot_payload_has_one_slide_per_section(self):
+        """Test the Copilot request carries title, section and assessment slides."""
+        responses.add(
+            responses.POST,
+            "https://graph.microsoft.com/beta/copilot/powerpoint/createPresentation",
+            json={"shareUrl": "https://share/p"},
+            status=201,
+        )
+
+        result = create_presentation_via_copilot(SAMPLE_PLAN, "token")
+
+        assert result == {"shareUrl": "https://share/p"}
+        slides = json.loads(responses.calls[0].request.body)["slides"]
+        assert [slide["title"] for slide in slides] == [
+            "Ecosystems",
+            "Intro",
+            "Assessments",
+        ]
+        assert slides[1]["content"] == "Overview"
@@ -5,13 +5,7 @@ Tests the functionality of suggesting Open Educational Resources
 from OER Commons for educational topics.
 """
 
-import sys
-import os
-
-# Add the code directory to Python path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "code"))
-
-from educator_agent.oer_resource_finder import suggest_oer  # noqa: E402
+from educator_agent.oer_resource_finder import suggest_oer
 
 
 class TestOERResourceFinder:
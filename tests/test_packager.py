@@ -0,0 +1,33 @@
+"""
+Tests for the ZIP packaging utility.
+"""
+
+import json
+import zipfile
+
+from educator_agent.packager import package_outputs
+
+
+class TestPackager:
+    """Test suite for package_outputs."""
+
+    def test_plan_data_written_without_json_file(self, tmp_path):
+        """Test the plan dict is serialized into the ZIP without a temp file."""
+        plan = {"lesson_title": "Ecosystems", "learning_objectives": ["Define"]}
+        out_zip = package_outputs(out_zip=tmp_path / "pkg.zip", plan_data=plan)
+
+        with zipfile.ZipFile(out_zip) as zipf:
+            assert sorted(zipf.namelist()) == ["README.md", "lesson_plan.json"]
+            assert json.loads(zipf.read("lesson_plan.json")) == plan
+
+    def test_readme_built_from_plan_json_file(self, tmp_path):
+        """Test a plan file is archived as-is and feeds the README."""
+        plan_file = tmp_path / "plan.json"
+        plan_file.write_text(json.dumps({"lesson_title": "Ecosystems"}))
+        out_zip = package_outputs(
+            plan_json_path=plan_file, out_zip=tmp_path / "pkg.zip"
+        )
+
+        with zipfile.ZipFile(out_zip) as zipf:
+            assert zipf.read("lesson_plan.json") == plan_file.read_bytes()
+            assert zipf.read("README.md").startswith(b"# Ecosystems")
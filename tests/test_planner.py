@@ -8,24 +8,28 @@ that the JSON schema validation passes correctly.
 import json
 import pytest
 from unittest.mock import Mock, patch
-import sys
-import os
 
-# Add the code directory to Python path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "code"))
-
-from educator_agent.curriculum_planner import (  # noqa: E402
+from educator_agent.curriculum_planner import (
     generate_prompt,
     call_llm,
     validate_plan,
     plan_curriculum,
     CURRICULUM_SCHEMA,
+    _complete,
+    _RECENT_PLANS,
 )
 
+from .conftest import MOCKED_PLAN
+
 
 class TestCurriculumPlanner:
     """Test suite for curriculum planner functionality."""
 
+    def setup_method(self):
+        """Start every test with empty in-process reply and plan caches."""
+        _complete.cache_clear()
+        _RECENT_PLANS.clear()
+
     def test_generate_prompt(self):
         """Test prompt generation with various parameters."""
         params = {
@@ -48,6 +52,16 @@ class TestCurriculumPlanner:
         assert "content_outline" in prompt
         assert "suggested_assessments" in prompt
 
+    def test_generate_prompt_reused_for_same_params(self):
+        """Test repeated params return the same prompt whatever the constraints type."""
+        params = {"grade_level": "5th Grade", "subject": "Science"}
+
+        first = generate_prompt({**params, "constraints": ["age-appropriate"]})
+        second = generate_prompt({**params, "constraints": ("age-appropriate",)})
+
+        assert first is second
+        assert "Constraints: None specified" in generate_prompt(params)
+
     def test_validate_plan_valid_schema(self):
         """Test validation passes with valid curriculum plan."""
         valid_plan = {
@@ -103,35 +117,44 @@ class TestCurriculumPlanner:
         with pytest.raises(ValueError, match="Validation error"):
             validate_plan(invalid_plan)
 
+    def test_validate_plan_fast_checks_agree_with_schema(self):
+        """Test the direct type checks accept exactly what the schema accepts."""
+        from jsonschema import Draft202012Validator
+
+        from educator_agent.curriculum_planner import _matches_schema
+
+        base = {
+            "lesson_title": "T",
+            "learning_objectives": ["a"],
+            "content_outline": [{"title": "s", "description": "d", "extra": 1}],
+            "suggested_assessments": [],
+            "grade_level": "5th Grade",
+        }
+        variants = [
+            base,
+            {**base, "lesson_title": None},
+            {**base, "learning_objectives": ["a", 1]},
+            {**base, "suggested_assessments": "quiz"},
+            {**base, "content_outline": [{"title": "s"}]},
+            {**base, "content_outline": ["s"]},
+            "not a plan",
+        ]
+        validator = Draft202012Validator(CURRICULUM_SCHEMA)
+
+        for plan in variants:
+            assert _matches_schema(plan) == validator.is_valid(plan)
+
     @patch("educator_agent.curriculum_planner.client")
-    def test_call_llm_with_mock(self, mock_client):
+    def test_call_llm_with_mock(self, mock_client, mocked_openai_response):
         """Test LLM call with mocked OpenAI client."""
-        # Mock the OpenAI response
-        mock_response = Mock()
-        mock_response.choices = [Mock()]
-        mock_response.choices[0].message.content = json.dumps(
-            {
-                "lesson_title": "Mocked Lesson",
-                "learning_objectives": ["Mock objective 1", "Mock objective 2"],
-                "content_outline": [
-                    {"title": "Mock Section", "description": "Mock description"}
-                ],
-                "suggested_assessments": ["Mock assessment"],
-            }
-        )
-
-        mock_client.chat.completions.create.return_value = mock_response
+        mock_client.chat.completions.create.return_value = mocked_openai_response
 
         # Test the function
         prompt = "Test prompt"
         result = call_llm(prompt)
 
         # Assert the mocked response is returned correctly
-        assert result["lesson_title"] == "Mocked Lesson"
-        assert len(result["learning_objectives"]) == 2
-        assert len(result["content_outline"]) == 1
-        assert result["content_outline"][0]["title"] == "Mock Section"
-        assert len(result["suggested_assessments"]) == 1
+        assert result == MOCKED_PLAN
 
         # Verify the client was called correctly
         mock_client.chat.completions.create.assert_called_once()
@@ -141,44 +164,43 @@ class TestCurriculumPlanner:
         assert call_args[1]["messages"][1]["content"] == prompt
 
     @patch("educator_agent.curriculum_planner.client")
-    def test_plan_curriculum_end_to_end(self, mock_client):
-        """Test the complete plan_curriculum workflow with mocked OpenAI."""
-        # Setup mock response
+    def test_call_llm_reuses_reply_for_same_prompt_and_model(self, mock_client):
+        """Test an identical prompt and model is answered without a second call."""
         mock_response = Mock()
         mock_response.choices = [Mock()]
-        mock_response.choices[0].message.content = json.dumps(
-            {
-                "lesson_title": "Environmental Science: Ecosystem Basics",
-                "learning_objectives": [
-                    "Students will define ecosystems and their components",
-                    "Students will identify relationships between organisms",
-                    "Students will analyze human impact on ecosystems",
-                ],
-                "content_outline": [
-                    {
-                        "title": "Introduction to Ecosystems",
-                        "description": "Define ecosystems and provide examples from local environment",
-                    },
-                    {
-                        "title": "Ecosystem Components",
-                        "description": "Explore biotic and abiotic factors through interactive activities",
-                    },
-                    {
-                        "title": "Interactions and Relationships",
-                        "description": "Examine predator-prey relationships and food webs",
-                    },
-                ],
-                "suggested_assessments": [
-                    "Ecosystem mapping activity",
-                    "Biotic vs abiotic sorting exercise",
-                    "Food web construction project",
-                    "Exit ticket with vocabulary terms",
-                ],
-            }
-        )
+        mock_response.choices[0].message.content = '{"lesson_title": "Cached"}'
+        mock_client.chat.completions.create.return_value = mock_response
+
+        first = call_llm("Same prompt")
+        first["lesson_title"] = "Mutated"
+        second = call_llm("Same prompt")
+        call_llm("Same prompt", model="gpt-4")
 
+        assert second == {"lesson_title": "Cached"}
+        assert mock_client.chat.completions.create.call_count == 2
+
+    @patch("educator_agent.curriculum_planner.client")
+    def test_call_llm_strips_markdown_fences(self, mock_client):
+        """Test fenced and unfenced replies parse to the same plan."""
+        mock_response = Mock()
+        mock_response.choices = [Mock()]
         mock_client.chat.completions.create.return_value = mock_response
 
+        for i, reply in enumerate(
+            [
+                '```json\n{"lesson_title": "Fenced"}\n```',
+                '```\n{"lesson_title": "Fenced"}```',
+                '{"lesson_title": "Fenced"}',
+            ]
+        ):
+            mock_response.choices[0].message.content = reply
+            assert call_llm(f"Prompt {i}") == {"lesson_title": "Fenced"}
+
+    @patch("educator_agent.curriculum_planner.client")
+    def test_plan_curriculum_end_to_end(self, mock_client, mocked_openai_response):
+        """Test the complete plan_curriculum workflow with mocked OpenAI."""
+        mock_client.chat.completions.create.return_value = mocked_openai_response
+
         # Test parameters
         params = {
             "grade_level": "8th Grade",
@@ -220,6 +242,49 @@ class TestCurriculumPlanner:
         # Verify OpenAI client was called
         mock_client.chat.completions.create.assert_called_once()
 
+    @patch("educator_agent.curriculum_planner.client")
+    def test_paraphrased_subject_reuses_plan(self, mock_client):
+        """Test a reworded subject is served from a recent plan, not the API."""
+        mock_response = Mock()
+        mock_response.choices = [Mock()]
+        mock_response.choices[0].message.content = json.dumps(
+            {
+                "lesson_title": "Ecosystems",
+                "learning_objectives": ["Define an ecosystem"],
+                "content_outline": [{"title": "Intro", "description": "Overview"}],
+                "suggested_assessments": ["Exit ticket"],
+            }
+        )
+        mock_client.chat.completions.create.return_value = mock_response
+        params = {"grade_level": "5th Grade", "subject": "Ecosystems"}
+
+        first = plan_curriculum(params)
+        first["lesson_title"] = "Mutated"
+        reused = plan_curriculum({**params, "subject": "the ecosystem"})
+        plan_curriculum({**params, "subject": "Food webs"})
+        plan_curriculum({**params, "grade_level": "8th Grade"})
+
+        assert reused["lesson_title"] == "Ecosystems"
+        assert mock_client.chat.completions.create.call_count == 3
+
+    @patch("educator_agent.curriculum_planner.client")
+    def test_overlapping_subjects_and_models_miss_recent_plans(
+        self, mock_client, mocked_openai_response
+    ):
+        """Test only exact rewordings reuse a plan, and the model reaches the API."""
+        mock_client.chat.completions.create.return_value = mocked_openai_response
+        params = {
+            "grade_level": "3rd Grade",
+            "subject": "Parts of a Plant: Roots, Stems, Leaves",
+        }
+
+        plan_curriculum(params)
+        plan_curriculum({**params, "subject": params["subject"] + ", Flowers"})
+        plan_curriculum({**params, "model": "gpt-4"})
+
+        calls = mock_client.chat.completions.create.call_args_list
+        assert [call.kwargs["model"] for call in calls] == ["gpt-4o", "gpt-4o", "gpt-4"]
+
     def test_fallback_mode_no_client(self):
         """Test fallback mode when no OpenAI client is available."""
         # Temporarily patch the client to None
@@ -237,6 +302,17 @@ class TestCurriculumPlanner:
             # Validate the fallback plan passes schema validation
             validate_plan(result)  # Should not raise any exception
 
+    def test_demo_plan_skips_sanitizer(self):
+        """Test the built-in demo plan is returned without content sanitization."""
+        params = {"grade_level": "5th Grade", "subject": "Science"}
+        with patch("educator_agent.curriculum_planner.client", None), patch(
+            "educator_agent.curriculum_planner.enforce_constraints"
+        ) as sanitize:
+            result = plan_curriculum(params)
+
+        sanitize.assert_not_called()
+        assert result["lesson_title"] == "Introduction to Environmental Science"
+
     def test_schema_compliance(self):
         """Test that the CURRICULUM_SCHEMA is properly defined."""
         # Verify required fields
@@ -5,17 +5,11 @@ Tests profanity filtering, PII redaction, and constraint enforcement
 on curriculum plans.
 """
 
-import sys
-import os
-
-# Add the code directory to Python path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "code"))
-
 from educator_agent.sanitizer import (
     clean_text,
     enforce_constraints,
     ContentSanitizer,
-)  # noqa: E402
+)
 
 
 class TestContentSanitizer:
@@ -38,6 +32,27 @@ class TestContentSanitizer:
         cleaned = self.sanitizer.clean_text(clean_text_input)
         assert cleaned == clean_text_input
 
+    def test_profanity_prefilter_matches_censor(self):
+        """Test the prefilter skips censoring only text it would not change."""
+        from unittest.mock import patch
+
+        from educator_agent.sanitizer import profanity
+
+        for text in (
+            "This is damn difficult",
+            "What a bull shit idea",
+            "Such a sh1t day",
+            "Some @ss in class",
+        ):
+            assert self.sanitizer._may_contain_profanity(text)
+            assert profanity.censor(text) != text
+
+        with patch.object(profanity, "censor") as mock_censor:
+            cleaned = self.sanitizer.clean_text("Plants turn sunlight into energy")
+
+        assert cleaned == "Plants turn sunlight into energy"
+        mock_censor.assert_not_called()
+
     def test_clean_text_names(self):
         """Test full name redaction."""
         text_with_names = (
@@ -86,6 +101,21 @@ class TestContentSanitizer:
         assert "1234-5678-9012-3456" not in cleaned
         assert "[REDACTED]" in cleaned
 
+    def test_clean_text_adjacent_pii_of_different_classes(self):
+        """Test PII touching PII of another class is still fully redacted."""
+        cases = {
+            "4111111111111111student42@school.org": "school.org",
+            "123-45-6789555-123-4567": "6789",
+            "12345678901234567890": "7890",
+        }
+        for text, leaked in cases.items():
+            cleaned = self.sanitizer.clean_text(text)
+            assert leaked not in cleaned
+            expected = text
+            for pattern in self.sanitizer.patterns.values():
+                expected = pattern.sub("[REDACTED]", expected)
+            assert cleaned == expected
+
     def test_clean_text_non_string(self):
         """Test that non-string inputs are returned unchanged."""
         assert self.sanitizer.clean_text(123) == 123
@@ -136,6 +166,27 @@ class TestContentSanitizer:
         assert "metadata" in cleaned
         assert cleaned["metadata"]["numbers"] == [1, 2, 3]
 
+    def test_clean_dict_deep_and_cyclic_structures(self):
+        """Test deep nesting and self-references are cleaned without recursion."""
+        deep = current = {}
+        for _ in range(5000):
+            current["child"] = current = {}
+        current["contact"] = "info@school.edu"
+
+        looped = {"title": "Email info@school.edu", "items": []}
+        looped["items"].append(looped)
+
+        cleaned_deep = self.sanitizer._clean_dict_recursively(deep)
+        cleaned_looped = self.sanitizer._clean_dict_recursively(looped)
+
+        node = cleaned_deep
+        while "child" in node:
+            node = node["child"]
+        assert node == {"contact": "[REDACTED]"}
+        assert current["contact"] == "info@school.edu"
+        assert cleaned_looped["title"] == "Email [REDACTED]"
+        assert cleaned_looped["items"][0] is cleaned_looped
+
 
 class TestModuleFunctions:
     """Test module-level functions."""
@@ -234,6 +285,27 @@ class TestModuleFunctions:
         assert "What is Photosynthesis?" in cleaned_plan["content_outline"][0]["title"]
         assert "[REDACTED]" not in str(cleaned_plan)
 
+    def test_repeated_strings_cleaned_once(self):
+        """Test identical strings in one plan are only scanned once."""
+        from unittest.mock import patch
+
+        plan = {
+            "learning_objectives": ["Review", "Review"],
+            "content_outline": [
+                {"title": "Review", "description": "Email teacher@school.edu"},
+                {"title": "Practice", "description": "Email teacher@school.edu"},
+            ],
+        }
+        sanitizer = ContentSanitizer()
+
+        with patch.object(
+            sanitizer, "clean_text", wraps=sanitizer.clean_text
+        ) as mock_clean:
+            cleaned = sanitizer.enforce_constraints(plan)
+
+        assert mock_clean.call_count == 3
+        assert cleaned["content_outline"][1]["description"] == "Email [REDACTED]"
+
 
 class TestEdgeCases:
     """Test edge cases and error conditions."""
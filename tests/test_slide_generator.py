@@ -4,16 +4,10 @@ Tests for the slide generator module.
 Tests the PowerPoint generation functionality with curriculum plan data.
 """
 
-import tempfile
 from pathlib import Path
-from unittest.mock import patch, Mock
-import sys
-import os
+from unittest.mock import MagicMock, patch, Mock
 
-# Add the code directory to Python path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "code"))
-
-from educator_agent.slide_generator import (  # noqa: E402
+from educator_agent.slide_generator import (
     sanitize_keyword,
     download_image,
     create_deck,
@@ -40,11 +34,12 @@ class TestSlideGenerator:
         # Test numbers and letters
         assert sanitize_keyword("Test 123 ABC") == "test+123+abc"
 
-    @patch("educator_agent.slide_generator.requests.get")
-    def test_download_image_success(self, mock_get):
+    @patch("educator_agent.slide_generator._http_session")
+    def test_download_image_success(self, mock_session):
         """Test successful image download."""
+        mock_get = mock_session.return_value.get
         # Mock successful response
-        mock_response = Mock()
+        mock_response = MagicMock()
         mock_response.iter_content.return_value = [b"fake_image_data"]
         mock_response.raise_for_status.return_value = None
         mock_get.return_value = mock_response
@@ -64,9 +59,24 @@ class TestSlideGenerator:
             assert result is not None
             assert isinstance(result, Path)
 
-    @patch("educator_agent.slide_generator.requests.get")
-    def test_download_image_failure(self, mock_get):
+    @patch("educator_agent.slide_generator._http_session")
+    def test_download_image_unreadable_removes_temp_file(self, mock_session, tmp_path):
+        """Test a download that fails to decode closes the response and leaves no file."""
+        mock_response = MagicMock()
+        mock_response.iter_content.return_value = [b"not an image"]
+        mock_session.return_value.get.return_value = mock_response
+
+        with patch("tempfile.tempdir", str(tmp_path)):
+            result = download_image("test keyword")
+
+        assert result is None
+        assert list(tmp_path.iterdir()) == []
+        mock_response.__exit__.assert_called_once()
+
+    @patch("educator_agent.slide_generator._http_session")
+    def test_download_image_failure(self, mock_session):
         """Test image download failure handling."""
+        mock_get = mock_session.return_value.get
         # Mock failed response
         mock_get.side_effect = Exception("Network error")
 
@@ -75,7 +85,7 @@ class TestSlideGenerator:
         # Should return None on failure
         assert result is None
 
-    def test_create_deck_basic(self):
+    def test_create_deck_basic(self, tmp_path):
         """Test basic PowerPoint deck creation."""
         # Sample curriculum plan data
         sample_plan = {
@@ -97,27 +107,17 @@ class TestSlideGenerator:
             "suggested_assessments": ["Quiz on basic concepts", "Hands-on activity"],
         }
 
-        # Create temporary output file
-        with tempfile.NamedTemporaryFile(suffix=".pptx", delete=False) as tmp_file:
-            output_path = Path(tmp_file.name)
-
-        try:
-            # Mock image download to avoid network calls
-            with patch(
-                "educator_agent.slide_generator.download_image", return_value=None
-            ):
-                create_deck(sample_plan, output_path)
+        output_path = tmp_path / "deck.pptx"
 
-            # Verify file was created
-            assert output_path.exists()
-            assert output_path.stat().st_size > 0
+        # Mock image download to avoid network calls
+        with patch("educator_agent.slide_generator.download_image", return_value=None):
+            create_deck(sample_plan, output_path)
 
-        finally:
-            # Clean up
-            if output_path.exists():
-                output_path.unlink()
+        # Verify file was created
+        assert output_path.exists()
+        assert output_path.stat().st_size > 0
 
-    def test_create_deck_empty_plan(self):
+    def test_create_deck_empty_plan(self, tmp_path):
         """Test deck creation with minimal plan data."""
         # Minimal plan data
         minimal_plan = {
@@ -127,23 +127,15 @@ class TestSlideGenerator:
             "suggested_assessments": [],
         }
 
-        # Create temporary output file
-        with tempfile.NamedTemporaryFile(suffix=".pptx", delete=False) as tmp_file:
-            output_path = Path(tmp_file.name)
+        output_path = tmp_path / "deck.pptx"
 
-        try:
-            create_deck(minimal_plan, output_path)
-
-            # Should still create a valid file
-            assert output_path.exists()
-            assert output_path.stat().st_size > 0
+        create_deck(minimal_plan, output_path)
 
-        finally:
-            # Clean up
-            if output_path.exists():
-                output_path.unlink()
+        # Should still create a valid file
+        assert output_path.exists()
+        assert output_path.stat().st_size > 0
 
-    def test_create_deck_missing_fields(self):
+    def test_create_deck_missing_fields(self, tmp_path):
         """Test deck creation with missing plan fields."""
         # Plan with missing fields
         incomplete_plan = {
@@ -151,23 +143,15 @@ class TestSlideGenerator:
             # Missing other required fields
         }
 
-        # Create temporary output file
-        with tempfile.NamedTemporaryFile(suffix=".pptx", delete=False) as tmp_file:
-            output_path = Path(tmp_file.name)
-
-        try:
-            # Should handle missing fields gracefully
-            create_deck(incomplete_plan, output_path)
+        output_path = tmp_path / "deck.pptx"
 
-            assert output_path.exists()
-            assert output_path.stat().st_size > 0
+        # Should handle missing fields gracefully
+        create_deck(incomplete_plan, output_path)
 
-        finally:
-            # Clean up
-            if output_path.exists():
-                output_path.unlink()
+        assert output_path.exists()
+        assert output_path.stat().st_size > 0
 
-    def test_create_deck_with_subdirectory(self):
+    def test_create_deck_with_subdirectory(self, tmp_path):
         """Test deck creation in a subdirectory that doesn't exist."""
         sample_plan = {
             "lesson_title": "Directory Test",
@@ -177,15 +161,79 @@ class TestSlideGenerator:
         }
 
         # Create path with non-existent subdirectory
-        with tempfile.TemporaryDirectory() as tmp_dir:
-            output_path = Path(tmp_dir) / "subdir" / "test.pptx"
-
-            with patch(
-                "educator_agent.slide_generator.download_image", return_value=None
-            ):
-                create_deck(sample_plan, output_path)
-
-            # Should create directory and file
-            assert output_path.exists()
-            assert output_path.parent.exists()
-            assert output_path.stat().st_size > 0
+        output_path = tmp_path / "subdir" / "test.pptx"
+
+        with patch("educator_agent.slide_generator.download_image", return_value=None):
+            create_deck(sample_plan, output_path)
+
+        # Should create directory and file
+        assert output_path.exists()
+        assert output_path.parent.exists()
+        assert output_path.stat().st_size > 0
+
+    def test_create_deck_downloads_images_for_each_section(self, tmp_path):
+        """Test every section image is fetched and slides keep outline order."""
+        from pptx import Presentation
+
+        sample_plan = {
+            "lesson_title": "Order Test",
+            "learning_objectives": ["Test objective"],
+            "content_outline": [
+                {"title": title, "description": "Test content"}
+                for title in ("First", "Second", "Third")
+            ],
+            "suggested_assessments": [],
+        }
+        output_path = tmp_path / "order.pptx"
+
+        with patch(
+            "educator_agent.slide_generator.download_image", return_value=None
+        ) as mock_download:
+            create_deck(sample_plan, output_path)
+
+        assert sorted(c.args[0] for c in mock_download.call_args_list) == [
+            "First",
+            "Second",
+            "Third",
+        ]
+        titles = [slide.shapes.title.text for slide in Presentation(output_path).slides]
+        assert titles == ["Order Test", "First", "Second", "Third"]
+
+    @patch("educator_agent.slide_generator._http_session")
+    def test_download_image_resizes_large_jpeg(self, mock_session):
+        """Test a wide JPEG is scaled down to max_width keeping its aspect."""
+        import io
+        from PIL import Image
+
+        buffer = io.BytesIO()
+        Image.new("RGB", (3200, 2400), (10, 200, 30)).save(buffer, "JPEG")
+        mock_response = MagicMock()
+        mock_response.iter_content.return_value = [buffer.getvalue()]
+        mock_session.return_value.get.return_value = mock_response
+
+        result = download_image("forest", max_width=800)
+
+        try:
+            with Image.open(result) as img:
+                assert img.size == (800, 600)
+        finally:
+            result.unlink()
+
+    @patch("educator_agent.slide_generator._http_session")
+    def test_download_image_keeps_in_spec_jpeg_bytes(self, mock_session):
+        """Test an image already within max_width is saved without re-encoding."""
+        import io
+        from PIL import Image
+
+        buffer = io.BytesIO()
+        Image.new("RGB", (800, 600), (10, 200, 30)).save(buffer, "JPEG")
+        mock_response = MagicMock()
+        mock_response.iter_content.return_value = [buffer.getvalue()]
+        mock_session.return_value.get.return_value = mock_response
+
+        result = download_image("forest", max_width=800)
+
+        try:
+            assert result.read_bytes() == buffer.getvalue()
+        finally:
+            result.unlink()